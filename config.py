@@ -70,6 +70,7 @@ CLUSTER_GROUP_SIZE = _get_env_int("CLUSTER_GROUP_SIZE", 100)
 USE_MULTIPROCESSING = _get_env_bool("USE_MULTIPROCESSING", False)
 USE_GPU = _get_env_bool("USE_GPU", False)
 MAX_WORKERS = _get_env_int("MAX_WORKERS", max(1, CPU_COUNT - 1))
+SCHEDULER_WORKERS = _get_env_int("LED_SCHED_WORKERS", min(16, CPU_COUNT))
 BATCH_SIZE = _get_env_int("BATCH_SIZE", 1000)
 SKIP_GPU_CHECK = _get_env_bool("SKIP_GPU_CHECK", True)
 SPATIAL_INDEX_TYPE = _get_env_str("SPATIAL_INDEX_TYPE", "grid")
@@ -116,7 +117,7 @@ def print_config():
     sections = {
         "Display Settings": ["WINDOW_WIDTH", "WINDOW_HEIGHT", "WINDOW_TITLE", "LED_SIZE", "LED_SPACING"],
         "LED Settings": ["DEFAULT_LED_COUNT", "MAX_FPS", "CLUSTER_GROUP_SIZE"],
-        "Performance Settings": ["USE_MULTIPROCESSING", "USE_GPU", "MAX_WORKERS", "BATCH_SIZE", "SKIP_GPU_CHECK"],
+        "Performance Settings": ["USE_MULTIPROCESSING", "USE_GPU", "MAX_WORKERS", "SCHEDULER_WORKERS", "BATCH_SIZE", "SKIP_GPU_CHECK"],
         "Memory Management": ["MAX_SEGMENTS_TOTAL", "MAX_SEGMENTS_PER_EFFECT", "MAX_EFFECTS", "MAX_LEDS_PER_CLUSTER"],
         "OSC Settings": ["OSC_SERVER_IP", "OSC_SERVER_PORT"],
         "System Information": ["CPU_COUNT"]
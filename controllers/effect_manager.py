@@ -39,6 +39,7 @@ class EffectManager:
         self.effects: Dict[int, LightEffect] = {}
         self.effect_groups: Dict[str, Set[int]] = {}  # Group effects for batch processing
         self.active_effect_ids: Set[int] = set()  # Track active effects
+        self.effects_version = 0  # Bumped whenever effects are added or removed
         self.batch_size = batch_size
         self.use_multiprocessing = use_multiprocessing
         
@@ -88,6 +89,7 @@ class EffectManager:
                 
             self.effects[effect_id] = effect
             self.active_effect_ids.add(effect_id)
+            self.effects_version += 1
             
             # Add to group
             if group not in self.effect_groups:
@@ -119,6 +121,7 @@ class EffectManager:
             # Get the effect and return to pool if possible
             effect = self.effects.pop(effect_id)
             self.active_effect_ids.discard(effect_id)
+            self.effects_version += 1
             
             # Try to return to object pool
             try:
@@ -150,47 +153,39 @@ class EffectManager:
         Returns:
             Dict[str, float]: Performance metrics
         """
-        self.perf_monitor.start_measurement("update_all")
-        
-        with self.lock:
-            active_effects = {
-                effect_id: effect 
-                for effect_id, effect in self.effects.items()
-                if effect_id in self.active_effect_ids
-            }
-            
-        if not active_effects:
-            self.perf_monitor.end_measurement("update_all")
-            return self.perf_monitor.get_metrics()
-            
-        # Update effects in batches
-        self.perf_monitor.start_measurement("batch_updates")
-        
-        # Group effects into batches
-        batches = []
-        current_batch = []
-        
-        for effect in active_effects.values():
-            current_batch.append(effect)
-            
-            if len(current_batch) >= self.batch_size:
-                batches.append(current_batch)
-                current_batch = []
+        with self.perf_monitor.measure("update_all"):
+            with self.lock:
+                active_effects = {
+                    effect_id: effect 
+                    for effect_id, effect in self.effects.items()
+                    if effect_id in self.active_effect_ids
+                }
                 
-        if current_batch:
-            batches.append(current_batch)
-            
-        # Submit batches to executor
-        futures = []
-        for batch in batches:
-            futures.append(self.executor.submit(self._process_batch, batch))
-            
-        # Wait for all batches to complete
-        for future in futures:
-            future.result()
-            
-        self.perf_monitor.end_measurement("batch_updates")
-        self.perf_monitor.end_measurement("update_all")
+            if active_effects:
+                # Update effects in batches
+                with self.perf_monitor.measure("batch_updates"):
+                    # Group effects into batches
+                    batches = []
+                    current_batch = []
+                    
+                    for effect in active_effects.values():
+                        current_batch.append(effect)
+                        
+                        if len(current_batch) >= self.batch_size:
+                            batches.append(current_batch)
+                            current_batch = []
+                            
+                    if current_batch:
+                        batches.append(current_batch)
+                        
+                    # Submit batches to executor
+                    futures = []
+                    for batch in batches:
+                        futures.append(self.executor.submit(self._process_batch, batch))
+                        
+                    # Wait for all batches to complete
+                    for future in futures:
+                        future.result()
         
         return self.perf_monitor.get_metrics()
         
@@ -265,7 +260,7 @@ class EffectManager:
                 "total_effects": len(self.effects),
                 "active_effects": len(self.active_effect_ids),
                 "groups": {group: len(ids) for group, ids in self.effect_groups.items()},
-                "pool_size": self.effect_pool.used_size,
+                "pool_size": self.effect_pool.get_stats()["used_size"],
                 "performance": self.perf_monitor.get_metrics(),
                 "workers": self.max_workers,
                 "multiprocessing": self.use_multiprocessing,
@@ -24,6 +24,12 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("Installer")
 
+# Optional Cython extensions; each has a pure-Python fallback
+EXTENSIONS = [
+    os.path.join("utils", "_perfmon.pyx"),
+    os.path.join("utils", "_blend.pyx")
+]
+
 
 def parse_args():
     """Parse command line arguments."""
@@ -118,7 +124,7 @@ def copy_project_files(src_dir: str, dest_dir: str) -> bool:
             
             # Copy files
             for file in files:
-                if file.endswith(".py") or file.endswith(".md") or file.endswith(".txt"):
+                if file.endswith((".py", ".pyx", ".md", ".txt")):
                     src_file = os.path.join(root, file)
                     dest_file = os.path.join(dest_path, file)
                     shutil.copy2(src_file, dest_file)
@@ -130,6 +136,38 @@ def copy_project_files(src_dir: str, dest_dir: str) -> bool:
         return False
 
 
+def build_extensions(install_dir: str, venv_python: str) -> bool:
+    """
+    Compile the optional Cython extensions in place.
+    
+    Args:
+        install_dir (str): Installation directory
+        venv_python (str): Path to Python executable in the virtual environment
+        
+    Returns:
+        bool: True if all extensions were built
+    """
+    try:
+        subprocess.check_call([venv_python, "-c", "import Cython"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except (subprocess.CalledProcessError, OSError):
+        logger.info("Cython not installed, using the pure-Python fallbacks")
+        return False
+        
+    logger.info("Building Cython extensions")
+    
+    built = True
+    for extension in EXTENSIONS:
+        try:
+            subprocess.check_call([venv_python, "-m", "Cython.Build.Cythonize", "-i", extension],
+                                  cwd=install_dir)
+        except (subprocess.CalledProcessError, OSError) as e:
+            logger.warning(f"Failed to build {extension}, using the pure-Python fallback: {e}")
+            built = False
+            
+    return built
+
+
 def create_launcher(install_dir: str) -> bool:
     """
     Create a launcher script for the application.
@@ -243,6 +281,9 @@ def install_system(args):
         logger.error("Installation aborted: Failed to copy project files")
         return False
         
+    # Build optional extensions
+    build_extensions(install_dir, get_venv_python(venv_dir))
+        
     # Create launcher
     if not create_launcher(install_dir):
         logger.warning("Failed to create launcher script")
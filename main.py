@@ -352,7 +352,7 @@ def main():
     
     clustering_service = ClusteringService(max_leds_per_cluster=config.MAX_LEDS_PER_CLUSTER)
     
-    scheduler = Scheduler(max_workers=config.MAX_WORKERS)
+    scheduler = Scheduler(max_workers=config.SCHEDULER_WORKERS)
     scheduler.start()
     
     distribution_service = DistributionService(num_workers=config.MAX_WORKERS, 
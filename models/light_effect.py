@@ -2,7 +2,8 @@ from typing import Dict, List, Any, Tuple
 import numpy as np
 
 from models.light_segment import LightSegment
-from utils.color_utils import blend_colors, interpolate_color
+from utils.color_utils import blend_colors, interpolate_color, interpolate_color_vec
+from utils.memory_pool import color_buffer_pool
 
 
 class LightEffect:
@@ -76,54 +77,70 @@ class LightEffect:
         """
         Calculate the final color values for all LEDs.
         
+        Each span between two color points of a segment is interpolated and
+        written for all of its LEDs at once. The working buffers are taken
+        per call, so the preview and distribution threads can render the
+        same effect concurrently.
+        
         Returns:
             List[List[int]]: List of RGB colors for each LED
         """
-        led_colors = [[0, 0, 0] for _ in range(self.led_count)]
-        led_transparency = [1.0 for _ in range(self.led_count)]
+        led_count = self.led_count
+        led_colors = color_buffer_pool.get_array((led_count, 3), np.uint8)
+        led_transparency = color_buffer_pool.get_array((led_count,), np.float64)
+        try:
+            return self._render_leds(led_colors, led_transparency)
+        finally:
+            color_buffer_pool.return_array(led_colors)
+            color_buffer_pool.return_array(led_transparency)
+            
+    def _render_leds(self, led_colors: np.ndarray, led_transparency: np.ndarray) -> List[List[int]]:
+        """
+        Render the segments into zeroed working buffers.
+        
+        Args:
+            led_colors (np.ndarray): Zeroed RGB buffer, shape (led_count, 3) (uint8)
+            led_transparency (np.ndarray): Transparency buffer, shape (led_count,) (float64)
+            
+        Returns:
+            List[List[int]]: List of RGB colors for each LED
+        """
+        led_count = self.led_count
+        led_transparency.fill(1.0)
 
         for segment in self.segments.values():
             positions, colors = segment.get_light_data()
             
-            if not positions or not colors:
+            if len(positions) == 0 or len(colors) == 0:
                 continue
 
             for i in range(len(positions) - 1):
                 start_pos, end_pos = positions[i], positions[i+1]
-                start_color, end_color = colors[i], colors[i+1]
                 start_trans, end_trans = segment.transparency[i], segment.transparency[i+1]
                 
-                start_led = max(0, min(self.led_count - 1, int(start_pos)))
-                end_led = max(0, min(self.led_count - 1, int(end_pos)))
-                
-                if start_led > self.led_count - 1 or end_led < 0:
-                    continue
+                start_led = max(0, min(led_count - 1, int(start_pos)))
+                end_led = max(0, min(led_count - 1, int(end_pos)))
                     
                 if start_led == end_led:
                     if led_transparency[start_led] > start_trans:
-                        led_colors[start_led] = start_color
+                        led_colors[start_led] = colors[i]
                         led_transparency[start_led] = start_trans
                 else:
                     led_range = abs(end_led - start_led) + 1
                     direction = 1 if end_led >= start_led else -1
                     
-                    for j in range(led_range):
-                        pos = start_led + j * direction
-                        if pos < 0 or pos >= self.led_count:
-                            continue
-                            
-                        ratio = j / max(1, led_range - 1)
-                        
-                        color = interpolate_color(start_color, end_color, ratio)
-                        trans = start_trans + (end_trans - start_trans) * ratio
-                        
-                        if led_transparency[pos] > trans:
-                            led_colors[pos] = color
-                            led_transparency[pos] = trans
+                    pos = np.arange(start_led, end_led + direction, direction)
+                    ratio = np.arange(led_range) / max(1, led_range - 1)
+                    
+                    color = interpolate_color_vec(colors[i], colors[i+1], ratio.astype(np.float32)[:, None])
+                    trans = start_trans + (end_trans - start_trans) * ratio
+                    
+                    # The LEDs of a span are distinct, so they can be written together
+                    closer = led_transparency[pos] > trans
+                    pos = pos[closer]
+                    led_colors[pos] = color[closer]
+                    led_transparency[pos] = trans[closer]
 
-        for i in range(self.led_count):
-            opacity = 1.0 - led_transparency[i]
-            if opacity > 0:
-                led_colors[i] = [int(c * opacity) for c in led_colors[i]]
-        
-        return led_colors
\ No newline at end of file
+        # LEDs no segment reached stay black at full transparency
+        opacity = 1.0 - led_transparency
+        return np.minimum(led_colors * opacity[:, None], 255).astype(np.uint8).tolist()
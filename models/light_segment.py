@@ -6,6 +6,7 @@ from utils.color_utils import (
     color_from_palette,
     interpolate_color,
     apply_dimming,
+    apply_dimming_vec,
     calculate_gradient_colors
 )
 
@@ -61,6 +62,8 @@ class LightSegment:
         """
         if param_name == "color":
             setattr(self, param_name, value)
+            # Swap in a new buffer rather than filling the old one: segments are
+            # shared with device_manager.segments and read by other threads
             self.rgb_color = self.calculate_rgb()
             self.update_gradient_cache()
         elif param_name == "length":
@@ -81,15 +84,18 @@ class LightSegment:
         """
         self.gradient_cache = {}
     
-    def calculate_rgb(self) -> List[List[int]]:
+    def calculate_rgb(self) -> np.ndarray:
         """
         Calculate RGB values from color palette indices.
         
         Returns:
-            List[List[int]]: List of RGB values [[r, g, b], ...]
+            np.ndarray: RGB values, shape (N, 3) (uint8)
         """
-        return [color_from_palette(c) for c in self.color]
-    
+        rgb = np.zeros((len(self.color), 3), dtype=np.uint8)
+        for i, c in enumerate(self.color):
+            rgb[i] = color_from_palette(c)
+        return rgb
+        
     def update_position(self, fps: int):
         """
         Update position based on the current frame rate.
@@ -151,12 +157,12 @@ class LightSegment:
         else:
             return 0.0  
     
-    def get_light_data(self) -> Tuple[List[float], List[List[int]]]:
+    def get_light_data(self) -> Tuple[List[float], np.ndarray]:
         """
         Calculate current light data based on position, transparency, and gradient.
         
         Returns:
-            Tuple[List[float], List[List[int]]]: (Positions, Colors)
+            Tuple[List[float], np.ndarray]: (Positions, Colors of shape (N, 3) (uint8))
         """
         total_length = sum(self.length)
         if total_length <= 0:
@@ -176,6 +182,6 @@ class LightSegment:
             
         positions = [base_position + offset for offset in position_offsets]
       
-        dimmed_colors = [apply_dimming(color, dimming_factor) for color in self.rgb_color]
+        dimmed_colors = apply_dimming_vec(self.rgb_color, dimming_factor)
         
         return positions, dimmed_colors
\ No newline at end of file
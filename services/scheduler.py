@@ -1,9 +1,17 @@
+import os
+import sys
+import ctypes
+import ctypes.util
+import selectors
 import threading
 import time
-import heapq
+import queue
 import logging
-from typing import Dict, List, Callable, Any, Tuple, Set
+from typing import Dict, List, Callable, Any, Tuple, Set, Optional
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
+
+import config
 
 logger = logging.getLogger(__name__)
 
@@ -90,26 +98,346 @@ class Task:
         return self.priority.value < other.priority.value
 
 
+class IndexedHeap:
+    """
+    Binary min-heap of tasks indexed by task ID.
+    
+    Keeps the position of every task in the heap so that a task can be
+    removed or re-prioritized in O(log n) instead of being left behind
+    as a stale entry.
+    """
+    
+    def __init__(self):
+        """
+        Initialize an empty heap.
+        """
+        self._heap: List[Task] = []
+        self._pos: Dict[str, int] = {}
+        
+    def __len__(self) -> int:
+        return len(self._heap)
+        
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._pos
+        
+    def peek(self) -> Optional[Task]:
+        """
+        Get the task with the earliest next run without removing it.
+        
+        Returns:
+            Optional[Task]: The first task, or None if the heap is empty
+        """
+        return self._heap[0] if self._heap else None
+        
+    def push(self, task: Task):
+        """
+        Add a task to the heap, replacing any queued task with the same ID.
+        A replaced task is swapped in place and re-sifted, so rescheduling
+        costs a single O(log n) pass.
+        
+        Args:
+            task (Task): The task to add
+        """
+        index = self._pos.get(task.task_id)
+        if index is not None:
+            self._heap[index] = task
+            self.update(task.task_id)
+            return
+            
+        self._heap.append(task)
+        self._pos[task.task_id] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+        
+    def pop(self) -> Task:
+        """
+        Remove and return the task with the earliest next run.
+        
+        Returns:
+            Task: The first task
+        """
+        return self._remove_at(0)
+        
+    def remove(self, task_id: str) -> Optional[Task]:
+        """
+        Remove a task from the heap.
+        
+        Args:
+            task_id (str): ID of the task to remove
+            
+        Returns:
+            Optional[Task]: The removed task, or None if not queued
+        """
+        index = self._pos.get(task_id)
+        if index is None:
+            return None
+        return self._remove_at(index)
+        
+    def update(self, task_id: str):
+        """
+        Restore heap order after a queued task's next run or priority changed.
+        
+        Args:
+            task_id (str): ID of the task that changed
+        """
+        index = self._pos.get(task_id)
+        if index is not None:
+            self._sift_down(self._sift_up(index))
+            
+    def _remove_at(self, index: int) -> Task:
+        heap = self._heap
+        task = heap[index]
+        last = heap.pop()
+        del self._pos[task.task_id]
+        
+        if index < len(heap):
+            heap[index] = last
+            self._pos[last.task_id] = index
+            self._sift_down(self._sift_up(index))
+            
+        return task
+        
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i].task_id] = i
+        self._pos[heap[j].task_id] = j
+        
+    def _sift_up(self, index: int) -> int:
+        heap = self._heap
+        while index > 0:
+            parent = (index - 1) >> 1
+            if not heap[index] < heap[parent]:
+                break
+            self._swap(index, parent)
+            index = parent
+        return index
+        
+    def _sift_down(self, index: int) -> int:
+        heap = self._heap
+        size = len(heap)
+        while True:
+            smallest = index
+            left = 2 * index + 1
+            right = left + 1
+            if left < size and heap[left] < heap[smallest]:
+                smallest = left
+            if right < size and heap[right] < heap[smallest]:
+                smallest = right
+            if smallest == index:
+                return index
+            self._swap(index, smallest)
+            index = smallest
+
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+class _Itimerspec(ctypes.Structure):
+    _fields_ = [("it_interval", _Timespec), ("it_value", _Timespec)]
+
+
+class _TimerFdBackend:
+    """
+    Kernel timer backend for recurring tasks (Linux only).
+    
+    Each recurring task is backed by a periodic timerfd registered with a
+    selector, so the kernel keeps the firing order and recurring tasks never
+    go through the task heap. A pipe registered alongside the timers lets
+    other threads wake the selector.
+    """
+    
+    CLOCK_MONOTONIC = 1
+    TFD_NONBLOCK = os.O_NONBLOCK
+    TFD_CLOEXEC = 0o2000000
+    
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Check if timerfd is available on this platform.
+        
+        Returns:
+            bool: True on Linux
+        """
+        return sys.platform.startswith("linux")
+        
+    def __init__(self):
+        """
+        Initialize the backend.
+        
+        Raises:
+            OSError: If timerfd cannot be loaded from libc
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._timerfd_create = libc.timerfd_create
+        self._timerfd_create.argtypes = [ctypes.c_int, ctypes.c_int]
+        self._timerfd_settime = libc.timerfd_settime
+        self._timerfd_settime.argtypes = [ctypes.c_int, ctypes.c_int,
+                                          ctypes.POINTER(_Itimerspec), ctypes.c_void_p]
+        
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        
+        self._fds: Dict[str, int] = {}
+        self._tasks: Dict[str, Task] = {}
+        self._closing: List[int] = []
+        self._closed = False
+        
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._fds
+        
+    def __len__(self) -> int:
+        return len(self._fds)
+        
+    @staticmethod
+    def _timespec(seconds: float) -> _Timespec:
+        seconds = max(seconds, 1e-9)
+        return _Timespec(int(seconds), int((seconds % 1) * 1e9))
+        
+    def add(self, task: Task, delay: float):
+        """
+        Arm a periodic timer for a recurring task.
+        
+        Args:
+            task (Task): The recurring task
+            delay (float): Seconds until the first execution
+        """
+        fd = self._timerfd_create(self.CLOCK_MONOTONIC, self.TFD_NONBLOCK | self.TFD_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "timerfd_create failed")
+            
+        spec = _Itimerspec(self._timespec(task.interval), self._timespec(delay))
+        if self._timerfd_settime(fd, 0, ctypes.byref(spec), None) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, "timerfd_settime failed")
+            
+        self._selector.register(fd, selectors.EVENT_READ, task)
+        self._fds[task.task_id] = fd
+        self._tasks[task.task_id] = task
+        
+    def remove(self, task_id: str) -> Optional[Task]:
+        """
+        Disarm the timer of a recurring task.
+        The descriptor is closed later by the selecting thread.
+        
+        Args:
+            task_id (str): ID of the task
+            
+        Returns:
+            Optional[Task]: The removed task, or None if not registered
+        """
+        fd = self._fds.pop(task_id, None)
+        if fd is None:
+            return None
+            
+        self._selector.unregister(fd)
+        self._closing.append(fd)
+        return self._tasks.pop(task_id)
+        
+    def tasks(self) -> List[Task]:
+        """
+        Get all tasks backed by a timer.
+        
+        Returns:
+            List[Task]: Registered tasks
+        """
+        return list(self._tasks.values())
+        
+    def wake(self):
+        """
+        Wake a thread blocked in select().
+        Does nothing once the backend is closed.
+        """
+        if self._closed:
+            return
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            # Pipe full (a wakeup is already pending) or closed concurrently
+            pass
+            
+    def select(self, timeout: Optional[float]) -> List[Task]:
+        """
+        Wait for timers to expire or for a wakeup.
+        
+        Args:
+            timeout (float): Maximum time to wait (None to wait indefinitely)
+            
+        Returns:
+            List[Task]: Tasks whose timers expired
+        """
+        due = []
+        for key, _ in self._selector.select(timeout):
+            try:
+                os.read(key.fd, 4096 if key.data is None else 8)
+            except (BlockingIOError, OSError):
+                continue
+            if key.data is not None:
+                due.append(key.data)
+                
+        self.close_pending()
+        return due
+        
+    def close_pending(self):
+        """
+        Close descriptors of removed timers.
+        """
+        while self._closing:
+            os.close(self._closing.pop())
+            
+    def close(self):
+        """
+        Disarm all timers and release the selector.
+        """
+        self._closed = True
+        for task_id in list(self._fds):
+            self.remove(task_id)
+        self.close_pending()
+        self._selector.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+
 class Scheduler:
     """
     Scheduler for managing and executing tasks.
+    
+    Due tasks run on a fixed-size thread pool. The pool size defaults to
+    config.SCHEDULER_WORKERS (the LED_SCHED_WORKERS environment variable, or
+    min(16, CPU count) if unset).
+    More workers help when tasks block on I/O (device sends, OSC); for
+    CPU-bound tasks extra workers mostly add GIL and lock contention, so
+    keep the pool small on many-core machines.
+    
+    On Linux, recurring tasks are driven by kernel timers (timerfd) instead
+    of being re-queued on the task heap after every run; other platforms
+    use the heap for all tasks.
     """
     
-    def __init__(self, max_workers: int = 4):
+    def __init__(self, max_workers: Optional[int] = None):
         """
         Initialize the scheduler.
         
         Args:
-            max_workers (int): Maximum number of worker threads
+            max_workers (int): Size of the worker thread pool (None to use config.SCHEDULER_WORKERS)
         """
+        if not max_workers:
+            max_workers = config.SCHEDULER_WORKERS
+            
         self.tasks: Dict[str, Task] = {}
-        self.task_queue: List[Task] = []
+        self.task_queue = IndexedHeap()
+        self._add_queue = queue.SimpleQueue()
+        self._wakeup = threading.Event()
         self.lock = threading.RLock()
         self.running = False
         self.scheduler_thread = None
-        self.worker_threads = []
         self.max_workers = max_workers
-        self.worker_semaphore = threading.Semaphore(max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._timer_backend: Optional[_TimerFdBackend] = None
         self.active_tasks: Set[str] = set()
         
     def schedule(self, task_id: str, func: Callable, args: Tuple = None, 
@@ -118,6 +446,9 @@ class Scheduler:
         """
         Schedule a task for execution.
         
+        The task is handed to the scheduler thread through a lock-free queue,
+        so producers never contend on the task heap lock.
+        
         Args:
             task_id (str): Unique identifier for the task
             func (Callable): Function to execute
@@ -130,19 +461,15 @@ class Scheduler:
         Returns:
             str: Task ID
         """
-        with self.lock:
-            if task_id in self.tasks:
-                self.cancel(task_id)
-                
-            task = Task(task_id, func, args, kwargs, priority, interval)
-            task.next_run = time.time() + delay
-   
-            self.tasks[task_id] = task
-            heapq.heappush(self.task_queue, task)
+        task = Task(task_id, func, args, kwargs, priority, interval)
+        task.next_run = time.time() + delay
 
-            logger.debug(f"Scheduled task {task_id} with priority {priority.name}")
-            
-            return task_id
+        self._add_queue.put(task)
+        self._notify()
+
+        logger.debug("Scheduled task %s with priority %s", task_id, priority.name)
+        
+        return task_id
             
     def cancel(self, task_id: str) -> bool:
         """
@@ -155,12 +482,22 @@ class Scheduler:
             bool: True if cancelled, False if not found
         """
         with self.lock:
-            if task_id not in self.tasks:
+            self._drain_add_queue()
+
+            task = self.tasks.get(task_id)
+            if task is None:
                 return False
 
-            self.tasks[task_id].cancel()
+            task.cancel()
+            self.task_queue.remove(task_id)
+            if self._timer_backend is not None:
+                self._timer_backend.remove(task_id)
+            if task_id not in self.active_tasks:
+                del self.tasks[task_id]
+
+            self._notify()
             
-            logger.debug(f"Cancelled task {task_id}")
+            logger.debug("Cancelled task %s", task_id)
             return True
             
     def cancel_all(self):
@@ -168,6 +505,8 @@ class Scheduler:
         Cancel all scheduled tasks.
         """
         with self.lock:
+            self._drain_add_queue()
+
             for task_id in list(self.tasks.keys()):
                 self.cancel(task_id)
                 
@@ -181,6 +520,21 @@ class Scheduler:
             return
             
         self.running = True
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="scheduler-worker")
+
+        if _TimerFdBackend.is_supported():
+            try:
+                backend = _TimerFdBackend()
+            except (OSError, AttributeError) as e:
+                logger.warning(f"Kernel timers unavailable, using task heap only: {e}")
+            else:
+                with self.lock:
+                    # Re-arm recurring tasks handed back to the heap by stop()
+                    for task in list(self.tasks.values()):
+                        if task.interval is not None and self.task_queue.remove(task.task_id) is not None:
+                            backend.add(task, task.next_run - time.time())
+                    self._timer_backend = backend
 
         self.scheduler_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
         self.scheduler_thread.start()
@@ -195,15 +549,23 @@ class Scheduler:
             return
             
         self.running = False
+        self._notify()
         
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=1.0)
             
-        for thread in self.worker_threads[:]:
-            if thread.is_alive():
-                thread.join(timeout=0.5)
-                
-        self.worker_threads = []
+        with self.lock:
+            backend, self._timer_backend = self._timer_backend, None
+            if backend is not None:
+                # Hand recurring tasks back to the heap so a restart keeps them
+                for task in backend.tasks():
+                    task.next_run = time.time() + task.interval
+                    self.task_queue.push(task)
+                backend.close()
+            
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         
         logger.info("Stopped scheduler")
         
@@ -212,8 +574,71 @@ class Scheduler:
         Main scheduler loop.
         """
         while self.running:
+            self._wakeup.clear()
+
+            with self.lock:
+                self._drain_add_queue()
             self._process_due_tasks()
-            time.sleep(0.01)
+
+            with self.lock:
+                next_task = self.task_queue.peek()
+                timeout = None if next_task is None else next_task.next_run - time.time()
+                backend = self._timer_backend
+
+            if backend is not None:
+                for task in backend.select(None if timeout is None else max(0.0, timeout)):
+                    self._dispatch_timer_task(task)
+            elif timeout is None or timeout > 0:
+                self._wakeup.wait(timeout)
+
+    def _notify(self):
+        """
+        Wake the scheduler loop.
+        """
+        self._wakeup.set()
+        backend = self._timer_backend
+        if backend is not None:
+            backend.wake()
+
+    def _dispatch_timer_task(self, task: Task):
+        """
+        Execute a recurring task whose kernel timer expired.
+        Expirations are skipped while the previous run is still in progress.
+        
+        Args:
+            task (Task): The task to execute
+        """
+        with self.lock:
+            if task.is_cancelled or task.task_id in self.active_tasks:
+                return
+            self.active_tasks.add(task.task_id)
+
+        self._execute_in_worker(task)
+            
+    def _drain_add_queue(self):
+        """
+        Move newly scheduled tasks from the add queue into the task heap.
+        Must be called with the lock held.
+        """
+        while True:
+            try:
+                task = self._add_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            old_task = self.tasks.get(task.task_id)
+            if old_task is not None:
+                old_task.cancel()
+                if self._timer_backend is not None:
+                    self._timer_backend.remove(task.task_id)
+
+            self.tasks[task.task_id] = task
+            if task.interval is not None and self._timer_backend is not None:
+                self.task_queue.remove(task.task_id)
+                self._timer_backend.add(task, task.next_run - time.time())
+            else:
+                # Takes the place of a queued task with the same ID
+                self.task_queue.push(task)
             
     def _process_due_tasks(self):
         """
@@ -223,15 +648,12 @@ class Scheduler:
         
         while self.running:
             with self.lock:
-                if not self.task_queue:
-                    break
-
-                next_task = self.task_queue[0]
+                next_task = self.task_queue.peek()
 
-                if next_task.next_run > current_time:
+                if next_task is None or next_task.next_run > current_time:
                     break
 
-                task = heapq.heappop(self.task_queue)
+                task = self.task_queue.pop()
 
                 if task.is_cancelled:
                     continue
@@ -242,34 +664,26 @@ class Scheduler:
             
     def _execute_in_worker(self, task: Task):
         """
-        Execute a task in a worker thread.
+        Execute a task on the worker pool.
         
         Args:
             task (Task): The task to execute
         """
         def worker():
-            with self.worker_semaphore:
-                task.execute()
-                
-                with self.lock:
-                    self.active_tasks.discard(task.task_id)
-
-                    if task.interval is not None and not task.is_cancelled:
-                        heapq.heappush(self.task_queue, task)
-                    else:
-                        self.tasks.pop(task.task_id, None)
+            task.execute()
             
-
             with self.lock:
-                if thread in self.worker_threads:
-                    self.worker_threads.remove(thread)
+                self.active_tasks.discard(task.task_id)
 
-        thread = threading.Thread(target=worker, daemon=True)
-        
-        with self.lock:
-            self.worker_threads.append(thread)
-            
-        thread.start()
+                if task.interval is not None and not task.is_cancelled:
+                    backend = self._timer_backend
+                    if backend is None or task.task_id not in backend:
+                        self.task_queue.push(task)
+                        self._notify()
+                elif self.tasks.get(task.task_id) is task:
+                    del self.tasks[task.task_id]
+
+        self._executor.submit(worker)
         
     def get_status(self) -> Dict[str, Any]:
         """
@@ -281,9 +695,10 @@ class Scheduler:
         with self.lock:
             return {
                 "queued_tasks": len(self.task_queue),
+                "pending_tasks": self._add_queue.qsize(),
                 "active_tasks": len(self.active_tasks),
                 "total_tasks": len(self.tasks),
+                "timer_tasks": len(self._timer_backend) if self._timer_backend is not None else 0,
                 "workers": self.max_workers,
-                "worker_threads": len(self.worker_threads),
                 "running": self.running
             }
\ No newline at end of file
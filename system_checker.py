@@ -2,12 +2,16 @@
 System checker for LED Tape Light System.
 Detects system configuration and installs required dependencies.
 """
+import functools
+import importlib.util
 import platform
+import shutil
 import subprocess
 import sys
 import os
 import logging
-from typing import Dict, List, Tuple, Optional
+import types
+from typing import List, Mapping, Tuple, Optional
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
@@ -36,6 +40,11 @@ BASE_DEPS = [
 CUDA_DEPS = ["numba>=0.54.0"]
 OPENCL_DEPS = ["pyopencl>=2021.1"]
 
+# Import names for packages whose module name differs from the pip name
+IMPORT_NAMES = {
+    "python-osc": "pythonosc"
+}
+
 # System-specific dependencies
 SYSTEM_DEPS = {
     WINDOWS_INTEL: BASE_DEPS + CUDA_DEPS + OPENCL_DEPS,
@@ -49,6 +58,7 @@ SYSTEM_DEPS = {
 }
 
 
+@functools.lru_cache(maxsize=1)
 def detect_system() -> str:
     """
     Detect the current system type.
@@ -95,36 +105,52 @@ def detect_system() -> str:
     return UNKNOWN
 
 
-def check_nvidia_gpu() -> bool:
+# Keywords identifying GPU vendors in video controller listings
+GPU_VENDOR_KEYWORDS = ("nvidia", "amd", "radeon")
+
+
+@functools.lru_cache(maxsize=1)
+def _gpu_vendors() -> frozenset:
     """
-    Check if NVIDIA GPU is available.
+    Detect GPU vendors with a single video controller probe per OS.
     
     Returns:
-        bool: True if NVIDIA GPU is detected
+        frozenset: Vendor keywords found in the video controller listing
     """
     system = platform.system().lower()
     
     if system == "windows":
-        try:
-            output = subprocess.check_output("wmic path win32_VideoController get name", shell=True).decode()
-            return "nvidia" in output.lower()
-        except:
-            return False
-            
+        command = ["wmic", "path", "win32_VideoController", "get", "name"]
     elif system == "darwin":
-        # macOS rarely has NVIDIA GPUs in modern systems
-        return False
-        
+        command = ["system_profiler", "SPDisplaysDataType"]
     elif system == "linux":
-        try:
-            output = subprocess.check_output("lspci | grep -i nvidia", shell=True).decode()
-            return len(output) > 0
-        except:
-            return False
-            
-    return False
+        command = ["lspci"]
+    else:
+        return frozenset()
+        
+    if shutil.which(command[0]) is None:
+        return frozenset()
+        
+    try:
+        output = subprocess.check_output(command).decode().lower()
+    except:
+        return frozenset()
+        
+    return frozenset(vendor for vendor in GPU_VENDOR_KEYWORDS if vendor in output)
+
+
+@functools.lru_cache(maxsize=1)
+def check_nvidia_gpu() -> bool:
+    """
+    Check if NVIDIA GPU is available.
+    
+    Returns:
+        bool: True if NVIDIA GPU is detected
+    """
+    return "nvidia" in _gpu_vendors()
 
 
+@functools.lru_cache(maxsize=1)
 def check_amd_gpu() -> bool:
     """
     Check if AMD GPU is available.
@@ -132,51 +158,21 @@ def check_amd_gpu() -> bool:
     Returns:
         bool: True if AMD GPU is detected
     """
-    system = platform.system().lower()
-    
-    if system == "windows":
-        try:
-            output = subprocess.check_output("wmic path win32_VideoController get name", shell=True).decode()
-            return "amd" in output.lower() or "radeon" in output.lower()
-        except:
-            return False
-            
-    elif system == "darwin":
-        # Many Macs have AMD GPUs
-        try:
-            output = subprocess.check_output("system_profiler SPDisplaysDataType", shell=True).decode()
-            return "amd" in output.lower() or "radeon" in output.lower()
-        except:
-            return False
-            
-    elif system == "linux":
-        try:
-            output = subprocess.check_output("lspci | grep -i amd", shell=True).decode()
-            return len(output) > 0
-        except:
-            try:
-                output = subprocess.check_output("lspci | grep -i radeon", shell=True).decode()
-                return len(output) > 0
-            except:
-                return False
-                
-    return False
+    return bool({"amd", "radeon"} & _gpu_vendors())
 
 
+@functools.lru_cache(maxsize=1)
 def check_cuda_availability() -> bool:
     """
     Check if CUDA is available.
     
     Returns:
-        bool: True if CUDA is available
+        bool: True if the CUDA compiler (nvcc) is on the PATH
     """
-    try:
-        output = subprocess.check_output("nvcc --version", shell=True).decode()
-        return "cuda" in output.lower()
-    except:
-        return False
+    return shutil.which("nvcc") is not None
 
 
+@functools.lru_cache(maxsize=1)
 def check_opencl_availability() -> bool:
     """
     Check if OpenCL is available.
@@ -247,26 +243,27 @@ def get_required_packages(system_type: str) -> List[str]:
     return packages
 
 
-def check_installed_packages() -> Dict[str, bool]:
+@functools.lru_cache(maxsize=1)
+def check_installed_packages() -> Mapping[str, bool]:
     """
     Check which packages are already installed.
+    The result is cached and read-only; install_packages() invalidates it.
     
     Returns:
-        Dict[str, bool]: Dictionary of package status
+        Mapping[str, bool]: Read-only mapping of package status
     """
     installed = {}
     
     for package in BASE_DEPS + CUDA_DEPS + OPENCL_DEPS:
         # Extract package name (without version)
         pkg_name = package.split(">=")[0].split("==")[0].strip()
+        module_name = IMPORT_NAMES.get(pkg_name, pkg_name)
         
-        try:
-            __import__(pkg_name)
-            installed[package] = True
-        except ImportError:
-            installed[package] = False
+        # Resolve the module without importing (and initializing) it
+        installed[package] = importlib.util.find_spec(module_name) is not None
             
-    return installed
+    # The cached result is shared by all callers, so it must not be mutable
+    return types.MappingProxyType(installed)
 
 
 def install_packages(packages: List[str]) -> bool:
@@ -289,6 +286,12 @@ def install_packages(packages: List[str]) -> bool:
         # Use subprocess to call pip
         cmd = [sys.executable, "-m", "pip", "install"] + packages
         subprocess.check_call(cmd)
+        
+        # Let find_spec see the new packages, then drop the stale results
+        importlib.invalidate_caches()
+        check_installed_packages.cache_clear()
+        check_cuda_availability.cache_clear()
+        check_opencl_availability.cache_clear()
         return True
     except subprocess.CalledProcessError as e:
         logger.error(f"Error installing packages: {e}")
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+
+from utils import performance
+from utils.performance import PerformanceMonitor, _PyRecorder
+
+try:
+    from utils._blend import blend_max
+    BLEND_EXTENSION = True
+except ImportError:
+    BLEND_EXTENSION = False
+
+
+def _pure_python_monitor(window_size: int) -> PerformanceMonitor:
+    """
+    Build a PerformanceMonitor running on the pure-Python hot path.
+    """
+    namespace = {name: value for name, value in vars(PerformanceMonitor).items()
+                 if name not in ("__dict__", "__weakref__")}
+    return type("PyPerformanceMonitor", (_PyRecorder,), namespace)(window_size)
+
+
+@unittest.skipUnless(performance.PERFMON_EXTENSION, "utils/_perfmon.pyx is not built")
+class PerfmonExtensionTest(unittest.TestCase):
+    """
+    Tests for the compiled PerformanceMonitor hot path in utils/_perfmon.pyx.
+    """
+    
+    def test_monitor_uses_compiled_recorder(self):
+        from utils._perfmon import Recorder, Span
+        
+        monitor = PerformanceMonitor()
+        self.assertIsInstance(monitor, Recorder)
+        self.assertIsInstance(monitor.measure("span"), Span)
+        
+    def test_compiled_put_drains_through_subclass(self):
+        monitor = PerformanceMonitor(window_size=4)
+        for value in range(4):
+            monitor.record_value("value", float(value))
+            
+        # Reaching drain_threshold makes the compiled _put call PerformanceMonitor._drain
+        self.assertEqual(monitor._pending.qsize(), 0)
+        
+    def test_metrics_match_pure_python(self):
+        compiled = PerformanceMonitor(window_size=8)
+        fallback = _pure_python_monitor(window_size=8)
+        for monitor in (compiled, fallback):
+            for value in range(20):
+                monitor.record_value("value", float(value) * 1.5)
+            monitor.start_measurement("block")
+            monitor.end_measurement("block")
+            
+        self.assertEqual(compiled.get_metrics()["value"], fallback.get_metrics()["value"])
+        self.assertEqual(compiled.get_metrics()["block"]["count"],
+                         fallback.get_metrics()["block"]["count"])
+
+
+@unittest.skipUnless(BLEND_EXTENSION, "utils/_blend.pyx is not built")
+class BlendExtensionTest(unittest.TestCase):
+    """
+    Tests for the compiled max-blend in utils/_blend.pyx.
+    """
+    
+    def test_blend_max_matches_numpy(self):
+        rng = np.random.default_rng(0)
+        out = rng.integers(0, 256, (50, 4), dtype=np.uint8)
+        src = rng.integers(0, 256, (7, 3), dtype=np.uint8)
+        idx = rng.integers(0, 7, 60).astype(np.intp)
+        
+        expected = out.copy()
+        np.maximum(expected[:, :3], src[idx[:50]], out=expected[:, :3])
+        
+        blend_max(out, src, idx)
+        np.testing.assert_array_equal(out, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+import numpy as np
+
+from utils.memory_pool import ArrayPool, ArrayPoolManager
+
+
+class ArrayPoolTest(unittest.TestCase):
+    """
+    Tests for the zero-on-return behaviour of the array pools.
+    """
+    
+    def test_returned_array_is_zeroed_and_reused(self):
+        pool = ArrayPool((4, 3))
+        array = pool.get_object()
+        array[:] = 255
+        
+        pool.return_object(array)
+        
+        reused = pool.get_object()
+        self.assertIs(reused, array)
+        self.assertFalse(reused.any())
+        self.assertEqual(pool.get_stats()["reused_count"], 1)
+        
+    def test_new_array_is_zeroed(self):
+        pool = ArrayPool((2, 3), dtype=np.float64)
+        array = pool.get_object()
+        
+        self.assertEqual(array.shape, (2, 3))
+        self.assertEqual(array.dtype, np.float64)
+        self.assertFalse(array.any())
+        
+    def test_manager_pools_by_shape_and_dtype(self):
+        manager = ArrayPoolManager()
+        rgb = manager.get_array((5, 3))
+        rgb[:] = 7
+        manager.return_array(rgb)
+        
+        self.assertIsNot(manager.get_array((5, 3), np.float64), rgb)
+        self.assertIsNot(manager.get_array((6, 3)), rgb)
+        
+        reused = manager.get_array((5, 3))
+        self.assertIs(reused, rgb)
+        self.assertFalse(reused.any())
+
+
+if __name__ == "__main__":
+    unittest.main()
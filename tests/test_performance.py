@@ -0,0 +1,40 @@
+import unittest
+
+from utils.performance import PerformanceMonitor
+
+
+class PerformanceMonitorTest(unittest.TestCase):
+    """
+    Tests for PerformanceMonitor, on whichever hot path is available.
+    """
+    
+    def test_recorded_values_keep_the_window(self):
+        monitor = PerformanceMonitor(window_size=8)
+        for value in range(20):
+            monitor.record_value("value", float(value))
+            
+        metrics = monitor.get_metrics()["value"]
+        self.assertEqual(metrics["count"], 8)
+        self.assertEqual(metrics["min"], 12.0)
+        self.assertEqual(metrics["max"], 19.0)
+        self.assertEqual(metrics["avg"], 15.5)
+        self.assertEqual(metrics["last"], 19.0)
+        
+    def test_measurements_are_recorded(self):
+        monitor = PerformanceMonitor()
+        monitor.start_measurement("block")
+        monitor.end_measurement("block")
+        with monitor.measure("span"):
+            pass
+        with self.assertLogs("utils.performance", "WARNING"):
+            monitor.end_measurement("never_started")
+        
+        metrics = monitor.get_metrics()
+        self.assertEqual(metrics["block"]["count"], 1)
+        self.assertEqual(metrics["span"]["count"], 1)
+        self.assertNotIn("never_started", metrics)
+        self.assertGreaterEqual(metrics["span"]["last"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
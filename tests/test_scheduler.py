@@ -0,0 +1,93 @@
+import time
+import unittest
+
+from services.scheduler import IndexedHeap, Scheduler, Task, _TimerFdBackend
+
+
+def _task(task_id: str, next_run: float) -> Task:
+    task = Task(task_id, lambda: None)
+    task.next_run = next_run
+    return task
+
+
+class IndexedHeapTest(unittest.TestCase):
+    """
+    Tests for the indexed task heap.
+    """
+    
+    def _drain(self, heap: IndexedHeap) -> list:
+        return [heap.pop().task_id for _ in range(len(heap))]
+        
+    def test_pop_returns_tasks_by_next_run(self):
+        heap = IndexedHeap()
+        for task_id, next_run in (("c", 3.0), ("a", 1.0), ("d", 4.0), ("b", 2.0)):
+            heap.push(_task(task_id, next_run))
+            
+        self.assertEqual(self._drain(heap), ["a", "b", "c", "d"])
+        
+    def test_push_replaces_task_with_same_id(self):
+        heap = IndexedHeap()
+        for task_id, next_run in (("a", 1.0), ("b", 2.0), ("c", 3.0)):
+            heap.push(_task(task_id, next_run))
+            
+        heap.push(_task("a", 5.0))
+        heap.push(_task("c", 0.5))
+        
+        self.assertEqual(len(heap), 3)
+        self.assertEqual(self._drain(heap), ["c", "b", "a"])
+        
+    def test_remove(self):
+        heap = IndexedHeap()
+        for task_id, next_run in (("a", 1.0), ("b", 2.0), ("c", 3.0)):
+            heap.push(_task(task_id, next_run))
+            
+        self.assertEqual(heap.remove("b").task_id, "b")
+        self.assertIsNone(heap.remove("b"))
+        self.assertNotIn("b", heap)
+        self.assertEqual(self._drain(heap), ["a", "c"])
+
+
+class SchedulerTest(unittest.TestCase):
+    """
+    Tests for the task scheduler.
+    """
+    
+    def setUp(self):
+        self.scheduler = Scheduler(max_workers=2)
+        
+    def tearDown(self):
+        self.scheduler.stop()
+        
+    def test_recurring_task_runs_after_restart(self):
+        hits = []
+        self.scheduler.start()
+        self.scheduler.schedule("tick", lambda: hits.append(1), interval=0.02)
+        time.sleep(0.1)
+        self.scheduler.stop()
+        
+        self.scheduler.start()
+        count = len(hits)
+        time.sleep(0.1)
+        self.assertGreater(len(hits), count)
+        
+    @unittest.skipUnless(_TimerFdBackend.is_supported(), "timerfd is Linux only")
+    def test_restart_rearms_kernel_timers(self):
+        self.scheduler.start()
+        self.scheduler.schedule("tick", lambda: None, interval=0.02)
+        time.sleep(0.05)
+        self.scheduler.stop()
+        
+        self.scheduler.start()
+        status = self.scheduler.get_status()
+        self.assertEqual(status["timer_tasks"], 1)
+        self.assertEqual(status["queued_tasks"], 0)
+        
+    @unittest.skipUnless(_TimerFdBackend.is_supported(), "timerfd is Linux only")
+    def test_wake_after_close_is_ignored(self):
+        backend = _TimerFdBackend()
+        backend.close()
+        backend.wake()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled max-blend of effect colors into LED buffer rows, used by
+views.multi_device_preview when Numba is not installed. Build it in place
+with:
+
+    cythonize -i utils/_blend.pyx
+
+views.multi_device_preview falls back to np.maximum when the extension is
+not built.
+"""
+
+
+cpdef void blend_max(unsigned char[:, :] out, const unsigned char[:, :] src,
+                     const Py_ssize_t[:] idx):
+    """
+    Max-blend src[idx[i]] into out[i] for every LED, per channel.
+
+    Args:
+        out (np.ndarray): LED rows to blend into, shape (N, >= 3) (uint8)
+        src (np.ndarray): Effect colors, shape (M, 3) (uint8)
+        idx (np.ndarray): Row of src for each row of out, at least N entries (intp)
+    """
+    cdef Py_ssize_t i, j, c
+    cdef Py_ssize_t n = out.shape[0]
+    cdef unsigned char value
+
+    with nogil:
+        for i in range(n):
+            j = idx[i]
+            for c in range(3):
+                value = src[j, c]
+                if value > out[i, c]:
+                    out[i, c] = value
@@ -0,0 +1,101 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled measurement hot path for utils.performance.PerformanceMonitor.
+
+Drop-in replacement for the pure-Python _PyRecorder/_PySpan classes. Build
+it in place with:
+
+    cythonize -i utils/_perfmon.pyx
+
+utils.performance falls back to the pure-Python classes when the extension
+is not built.
+"""
+import logging
+from time import perf_counter_ns
+
+logger = logging.getLogger("utils.performance")
+
+cdef object _perf_counter_ns = perf_counter_ns
+cdef object _MISSING = object()
+
+
+cdef class Recorder
+
+
+cdef class Span:
+    """
+    Context manager timing one block for a PerformanceMonitor.
+    """
+
+    cdef Recorder monitor
+    cdef object name
+    cdef long long t0
+
+    def __cinit__(self, Recorder monitor, name):
+        self.monitor = monitor
+        self.name = name
+        self.t0 = 0
+
+    def __enter__(self):
+        self.t0 = _perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        cdef long long end = _perf_counter_ns()
+        self.monitor._put(self.name, end - self.t0, 1e-9)
+        return False
+
+
+cdef class Recorder:
+    """
+    Measurement hot path of PerformanceMonitor.
+
+    Subclasses set _pending, _tls, lock and drain_threshold, and implement
+    _drain().
+    """
+
+    cdef public object _pending
+    cdef public object _tls
+    cdef public object lock
+    cdef public Py_ssize_t drain_threshold
+
+    cdef dict _start_times(self):
+        cdef dict start_times
+        try:
+            return self._tls.start_times
+        except AttributeError:
+            start_times = {}
+            self._tls.start_times = start_times
+            return start_times
+
+    cpdef _put(self, name, value, double scale):
+        pending = self._pending
+        pending.put((name, value, scale))
+        if pending.qsize() >= self.drain_threshold:
+            # Leave the drain to whoever already holds the lock
+            if self.lock.acquire(False):
+                try:
+                    self._drain()
+                finally:
+                    self.lock.release()
+
+    def _drain(self):
+        pass
+
+    def start_measurement(self, name):
+        self._start_times()[name] = _perf_counter_ns()
+
+    def end_measurement(self, name):
+        end = _perf_counter_ns()
+        start = self._start_times().pop(name, _MISSING)
+        if start is _MISSING:
+            logger.warning(f"No start time recorded for '{name}'")
+            return
+
+        self._put(name, end - start, 1e-9)
+
+    def record_value(self, name, value):
+        self._put(name, value, 1.0)
+
+    def measure(self, name):
+        return Span(self, name)
@@ -1,6 +1,14 @@
 
+from functools import lru_cache
+
 import numpy as np
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 def interpolate_color(color1, color2, ratio):
     """
@@ -21,6 +29,24 @@ def interpolate_color(color1, color2, ratio):
     ]
 
 
+def interpolate_color_vec(color1, color2, ratio):
+    """
+    Interpolate between two colors for a whole run of LEDs at once.
+    Vectorized counterpart of interpolate_color.
+    
+    Args:
+        color1 (list or np.ndarray): RGB values of the first color [r, g, b]
+        color2 (list or np.ndarray): RGB values of the second color [r, g, b]
+        ratio (float or np.ndarray): Interpolation ratio (0-1), or ratios of shape (N, 1)
+        
+    Returns:
+        np.ndarray: Interpolated RGB color, or colors of shape (N, 3) (uint8)
+    """
+    c1 = np.asarray(color1, dtype=np.float32)
+    c2 = np.asarray(color2, dtype=np.float32)
+    return np.clip(c1 + (c2 - c1) * ratio, 0, 255).astype(np.uint8)
+
+
 def blend_colors(colors, transparencies):
     """
     Blend multiple colors based on their transparencies.
@@ -32,7 +58,7 @@ def blend_colors(colors, transparencies):
     Returns:
         list: Blended RGB color [r, g, b]
     """
-    if not colors:
+    if len(colors) == 0:
         return [0, 0, 0]
     
     result = [0, 0, 0]
@@ -56,23 +82,123 @@ def blend_colors(colors, transparencies):
     return [max(0, min(255, int(c / max(total_alpha, 0.001)))) for c in result]
 
 
+def blend_colors_vec(colors, transparencies):
+    """
+    Blend the layered colors of a full strip at once.
+    Vectorized counterpart of blend_colors, JIT-compiled when Numba is available.
+    
+    Args:
+        colors (np.ndarray): Layer colors, shape (N_layers, N_leds, 3)
+        transparencies (np.ndarray): Layer transparencies, shape (N_layers, N_leds)
+        
+    Returns:
+        np.ndarray: Blended colors, shape (N_leds, 3) (uint8)
+    """
+    colors = np.asarray(colors)
+    if colors.shape[0] == 0:
+        return np.zeros((colors.shape[1], 3), dtype=np.uint8)
+    
+    trans = np.ascontiguousarray(transparencies, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        out = np.empty((colors.shape[1], 3), dtype=np.uint8)
+        _blend_kernel(np.ascontiguousarray(colors, dtype=np.float32), trans, out)
+        return out
+    return _blend_layers(colors, trans)
+
+
+def _blend_layers(colors, transparencies):
+    """
+    Blend layered colors with NumPy.
+    
+    Args:
+        colors (np.ndarray): Layer colors, shape (N_layers, N_leds, 3)
+        transparencies (np.ndarray): Layer transparencies, shape (N_layers, N_leds)
+        
+    Returns:
+        np.ndarray: Blended colors, shape (N_leds, 3) (uint8)
+    """
+    # Layers are composited top-down, the last layer being the topmost one
+    colors = np.asarray(colors, dtype=np.float32)[::-1]
+    alpha = np.clip(1.0 - transparencies[::-1], 0.0, 1.0)
+    
+    remaining_alpha = np.empty_like(alpha)
+    remaining_alpha[0] = 1.0
+    np.cumprod(1.0 - alpha[:-1], axis=0, out=remaining_alpha[1:])
+    
+    current_alpha = alpha * remaining_alpha
+    total_alpha = np.maximum(current_alpha.sum(axis=0), 0.001)
+    
+    result = (colors * current_alpha[..., None]).sum(axis=0) / total_alpha[:, None]
+    return np.clip(result, 0, 255).astype(np.uint8)
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _blend_kernel(colors, transparencies, out):
+        """
+        Blend layered colors in a single fused pass per LED.
+        
+        Args:
+            colors (np.ndarray): Layer colors, shape (N_layers, N_leds, 3)
+            transparencies (np.ndarray): Layer transparencies, shape (N_layers, N_leds)
+            out (np.ndarray): Output buffer, shape (N_leds, 3) (uint8)
+        """
+        n_layers = colors.shape[0]
+        for i in prange(colors.shape[1]):
+            r = 0.0
+            g = 0.0
+            b = 0.0
+            total = 0.0
+            for layer in range(n_layers - 1, -1, -1):
+                alpha = (1.0 - transparencies[layer, i]) * (1.0 - total)
+                if alpha <= 0.0:
+                    continue
+                r += colors[layer, i, 0] * alpha
+                g += colors[layer, i, 1] * alpha
+                b += colors[layer, i, 2] * alpha
+                total += alpha
+            
+            total = max(total, 0.001)
+            out[i, 0] = min(255, int(r / total))
+            out[i, 1] = min(255, int(g / total))
+            out[i, 2] = min(255, int(b / total))
+
+
+@lru_cache(maxsize=65536)
 def color_from_palette(color_index, palette_size=16777216):
     """
     Get RGB color from color index (0 to 16,777,215).
     Supports full 24-bit RGB color space (16.7 million colors).
+    Results are memoized since effects reuse a small set of palette indices.
     
     Args:
         color_index (int): Color index (0-16777215)
         palette_size (int): Total number of colors in palette
         
     Returns:
-        list: RGB color [r, g, b]
+        tuple: RGB color (r, g, b)
     """
     color_index = max(0, min(palette_size - 1, color_index))
     r = (color_index >> 16) & 0xFF
     g = (color_index >> 8) & 0xFF
     b = color_index & 0xFF
-    return [r, g, b]
+    return (r, g, b)
+
+
+def color_from_palette_vec(indices, palette_size=16777216):
+    """
+    Get RGB colors for an array of color indices.
+    Vectorized counterpart of color_from_palette.
+    
+    Args:
+        indices (np.ndarray): Color indices (0-16777215)
+        palette_size (int): Total number of colors in palette
+        
+    Returns:
+        np.ndarray: RGB colors, shape (*indices.shape, 3) (uint8)
+    """
+    idx = np.clip(indices, 0, palette_size - 1).astype(np.uint32)
+    return np.stack([(idx >> 16) & 0xFF, (idx >> 8) & 0xFF, idx & 0xFF], axis=-1).astype(np.uint8)
 
 
 def apply_dimming(color, dimming_factor):
@@ -91,29 +217,74 @@ def apply_dimming(color, dimming_factor):
     ]
 
 
+def apply_dimming_vec(colors, dimming_factor):
+    """
+    Apply dimming factor to all colors of an array at once.
+    Vectorized counterpart of apply_dimming.
+    
+    Args:
+        colors (np.ndarray): RGB colors, shape (N, 3)
+        dimming_factor (float): Dimming factor (0-1)
+        
+    Returns:
+        np.ndarray: Dimmed RGB colors, shape (N, 3) (uint8)
+    """
+    return np.clip(np.asarray(colors, dtype=np.float32) * dimming_factor, 0, 255).astype(np.uint8)
+
+
 def calculate_gradient_colors(colors, length):
     """
     Calculate a gradient of colors for a given length.
     
+    Results are memoized per (colors, length); the returned array is shared
+    between callers and read-only, so copy it before modifying.
+    
     Args:
         colors (list): List of RGB colors [[r, g, b], ...]
         length (int): Number of colors to generate
         
     Returns:
-        list: List of RGB colors for the gradient
+        np.ndarray: Array of RGB colors for the gradient, shape (length, 3)
+    """
+    return _grad_cached(tuple(tuple(int(v) for v in c) for c in colors), length)
+
+
+@lru_cache(maxsize=4096)
+def _grad_cached(colors, length):
+    """
+    Memoized gradient computation backing calculate_gradient_colors.
+    
+    Args:
+        colors (tuple): Tuple of RGB colors ((r, g, b), ...)
+        length (int): Number of colors to generate
+        
+    Returns:
+        np.ndarray: Read-only array of RGB colors, shape (length, 3)
     """
     if len(colors) < 2:
-        return [colors[0]] * length if colors else [[0, 0, 0]] * length
+        if len(colors) == 0:
+            result = np.zeros((length, 3), dtype=np.uint8)
+        else:
+            result = np.tile(np.asarray(colors[0], dtype=np.uint8), (length, 1))
+        result.flags.writeable = False
+        return result
     
-    result = []
+    colors = np.asarray(colors, dtype=np.float32)
     segments = len(colors) - 1
     colors_per_segment = length // segments
     remainder = length % segments
     
-    for i in range(segments):
-        segment_length = colors_per_segment + (1 if i < remainder else 0)
-        for j in range(segment_length):
-            ratio = j / max(1, segment_length - 1)
-            result.append(interpolate_color(colors[i], colors[i+1], ratio))
-            
-    return result
\ No newline at end of file
+    # Segment index, position within segment and interpolation ratio per output LED
+    segment_lengths = np.full(segments, colors_per_segment, dtype=np.int64)
+    segment_lengths[:remainder] += 1
+    segment_starts = np.cumsum(segment_lengths) - segment_lengths
+    
+    segment_index = np.repeat(np.arange(segments), segment_lengths)
+    offsets = np.arange(length) - segment_starts[segment_index]
+    ratio = offsets / np.maximum(1, segment_lengths - 1)[segment_index]
+    
+    start = colors[segment_index]
+    end = colors[segment_index + 1]
+    result = (start + (end - start) * ratio[:, None].astype(np.float32)).astype(np.uint8)
+    result.flags.writeable = False
+    return result
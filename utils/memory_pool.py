@@ -1,8 +1,10 @@
 import threading
-from typing import Callable, List, Any, Optional, Dict
+from typing import Callable, Any, Optional, Dict, Tuple
 import logging
 import time
-import weakref
+from collections import deque
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -22,14 +24,13 @@ class ObjectPool:
         """
         self.create_func = create_func
         self.max_size = max_size
-        self.pool: List[Any] = []
-        self.lock = threading.RLock()
+        self.pool: deque = deque()
+        self.lock = threading.Lock()
         self.created_count = 0
         self.reused_count = 0
         self.returned_count = 0
         self.last_cleaned = time.time()
-        self.used_objects: Dict[int, weakref.ref] = {}
-        self.used_size = 0
+        self._used_count = 0
         
     def get_object(self) -> Any:
         """
@@ -42,14 +43,13 @@ class ObjectPool:
             if self.pool:
                 obj = self.pool.pop()
                 self.reused_count += 1
-                logger.debug(f"Reused object from pool, {len(self.pool)} remaining")
+                logger.debug("Reused object from pool, %d remaining", len(self.pool))
             else:
                 obj = self.create_func()
                 self.created_count += 1
-                logger.debug(f"Created new object, total created: {self.created_count}")
+                logger.debug("Created new object, total created: %d", self.created_count)
 
-            self.used_objects[id(obj)] = weakref.ref(obj)
-            self.used_size = len(self.used_objects)
+            self._used_count += 1
             
             return obj
             
@@ -61,47 +61,25 @@ class ObjectPool:
             obj: The object to return
         """
         with self.lock:
+            self._used_count = max(0, self._used_count - 1)
 
             if len(self.pool) >= self.max_size:
-                logger.debug(f"Pool is full, discarding object")
+                logger.debug("Pool is full, discarding object")
                 return
                 
             self.pool.append(obj)
             self.returned_count += 1
-
-            obj_id = id(obj)
-            if obj_id in self.used_objects:
-                del self.used_objects[obj_id]
-                
-            self.used_size = len(self.used_objects)
-            logger.debug(f"Returned object to pool, total in pool: {len(self.pool)}")
+            logger.debug("Returned object to pool, total in pool: %d", len(self.pool))
             
     def cleanup(self, force: bool = False):
         """
-        Clean up expired weak references.
+        Periodic maintenance hook. Checked-out objects are only counted, not
+        tracked, so there is nothing to clean up.
         
         Args:
             force (bool): Force cleanup regardless of time since last cleanup
         """
-        current_time = time.time()
-
-        if not force and current_time - self.last_cleaned < 60:
-            return
-            
-        with self.lock:
-            expired = []
-            for obj_id, ref in self.used_objects.items():
-                if ref() is None:
-                    expired.append(obj_id)
-                    
-            for obj_id in expired:
-                del self.used_objects[obj_id]
-                
-            self.used_size = len(self.used_objects)
-            self.last_cleaned = current_time
-            
-            if expired:
-                logger.debug(f"Cleaned up {len(expired)} expired references")
+        self.last_cleaned = time.time()
                 
     def clear(self):
         """
@@ -125,10 +103,105 @@ class ObjectPool:
                 "created_count": self.created_count,
                 "reused_count": self.reused_count,
                 "returned_count": self.returned_count,
-                "used_size": self.used_size
+                "used_size": self._used_count
             }
 
 
+class ArrayPool(ObjectPool):
+    """
+    Object pool of fixed-shape NumPy arrays, such as per-segment RGB buffers.
+    Arrays are zeroed when returned so a reused buffer starts out black.
+    """
+    
+    def __init__(self, shape: Tuple[int, ...], dtype: Any = np.uint8, max_size: int = 1000):
+        """
+        Initialize the array pool.
+        
+        Args:
+            shape (Tuple[int, ...]): Shape of the pooled arrays
+            dtype: NumPy dtype of the pooled arrays
+            max_size (int): Maximum pool size
+        """
+        super().__init__(lambda: np.zeros(shape, dtype=dtype), max_size)
+        self.shape = shape
+        self.dtype = dtype
+        
+    def return_object(self, obj: np.ndarray):
+        """
+        Zero an array and return it to the pool.
+        
+        Args:
+            obj (np.ndarray): The array to return
+        """
+        obj.fill(0)
+        super().return_object(obj)
+
+
+class ArrayPoolManager:
+    """
+    Manages ArrayPools of buffers with different shapes and dtypes.
+    """
+    
+    def __init__(self, max_size: int = 1000):
+        """
+        Initialize the array pool manager.
+        
+        Args:
+            max_size (int): Maximum size of each pool
+        """
+        self.pools: Dict[Tuple[Tuple[int, ...], str], ArrayPool] = {}
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        
+    def get_array(self, shape: Tuple[int, ...], dtype: Any = np.uint8) -> np.ndarray:
+        """
+        Get a zeroed array from the pool of its shape and dtype.
+        The manager lock is only taken the first time a shape is seen.
+        
+        Args:
+            shape (Tuple[int, ...]): Shape of the array
+            dtype: NumPy dtype of the array
+            
+        Returns:
+            np.ndarray: A zeroed array from the pool or a new one
+        """
+        key = (tuple(shape), np.dtype(dtype).str)
+        pool = self.pools.get(key)
+        if pool is None:
+            with self.lock:
+                pool = self.pools.get(key)
+                if pool is None:
+                    pool = ArrayPool(key[0], dtype, self.max_size)
+                    self.pools[key] = pool
+                    
+        return pool.get_object()
+        
+    def return_array(self, array: np.ndarray):
+        """
+        Zero an array and return it to the pool of its shape and dtype.
+        
+        Args:
+            array (np.ndarray): An array previously got from get_array
+        """
+        pool = self.pools.get((array.shape, array.dtype.str))
+        if pool is not None:
+            pool.return_object(array)
+            
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get statistics for all pools.
+        
+        Returns:
+            Dict[str, Dict[str, int]]: Statistics for all pools, by shape and dtype
+        """
+        with self.lock:
+            return {f"{shape}:{dtype}": pool.get_stats() for (shape, dtype), pool in self.pools.items()}
+
+
+# Shared pool of color buffers, keyed by shape and dtype
+color_buffer_pool = ArrayPoolManager()
+
+
 class SegmentPoolManager:
     """
     Manages pools of LightSegment objects with different configurations.
@@ -144,6 +217,7 @@ class SegmentPoolManager:
     def get_segment(self, config_key: str, create_func: Callable[[], Any]) -> Any:
         """
         Get a segment from the appropriate pool.
+        The manager lock is only taken the first time a configuration is seen.
         
         Args:
             config_key (str): Configuration key for the pool
@@ -152,11 +226,15 @@ class SegmentPoolManager:
         Returns:
             Any: A segment from the pool or a new one
         """
-        with self.lock:
-            if config_key not in self.pools:
-                self.pools[config_key] = ObjectPool(create_func, max_size=1000)
+        pool = self.pools.get(config_key)
+        if pool is None:
+            with self.lock:
+                pool = self.pools.get(config_key)
+                if pool is None:
+                    pool = ObjectPool(create_func, max_size=1000)
+                    self.pools[config_key] = pool
 
-            return self.pools[config_key].get_object()
+        return pool.get_object()
             
     def return_segment(self, config_key: str, segment: Any):
         """
@@ -166,9 +244,9 @@ class SegmentPoolManager:
             config_key (str): Configuration key for the pool
             segment: The segment to return
         """
-        with self.lock:
-            if config_key in self.pools:
-                self.pools[config_key].return_object(segment)
+        pool = self.pools.get(config_key)
+        if pool is not None:
+            pool.return_object(segment)
                 
     def cleanup_all(self, force: bool = False):
         """
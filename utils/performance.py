@@ -1,29 +1,92 @@
 import time
-from typing import Dict, List, Any
+from typing import Dict, Tuple, Callable
+import functools
+import queue
 import threading
-import statistics
 import logging
+import numpy as np
+
+try:
+    from fastrlock.rlock import FastRLock as RLock
+except ImportError:
+    from threading import RLock
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
 
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
 
-class PerformanceMonitor:
+
+class _PySpan:
     """
-    Tracks and reports performance metrics.
+    Context manager timing one block for a PerformanceMonitor.
     """
     
-    def __init__(self, window_size: int = 100):
+    __slots__ = ("monitor", "name", "t0")
+    
+    def __init__(self, monitor: "_PyRecorder", name: str):
+        self.monitor = monitor
+        self.name = name
+        self.t0 = 0
+        
+    def __enter__(self) -> "_PySpan":
+        self.t0 = time.perf_counter_ns()
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.monitor._put(self.name, time.perf_counter_ns() - self.t0, 1e-9)
+
+
+class _PyRecorder:
+    """
+    Measurement hot path of PerformanceMonitor.
+    
+    Subclasses set _pending, _tls, lock and drain_threshold, and implement
+    _drain(). utils/_perfmon.pyx provides a compiled drop-in replacement.
+    """
+    
+    def _start_times(self) -> Dict[str, int]:
         """
-        Initialize the performance monitor.
+        Get the calling thread's start times, creating them on first use.
+        
+        Returns:
+            Dict[str, int]: Start times of the current thread
+        """
+        try:
+            return self._tls.start_times
+        except AttributeError:
+            start_times = self._tls.start_times = {}
+            return start_times
+        
+    def _put(self, name: str, value: float, scale: float):
+        """
+        Queue a value, draining the queue once enough values are pending.
         
         Args:
-            window_size (int): Number of measurements to keep for each metric
+            name (str): Name of the metric
+            value (float): Value to record, in stored units
+            scale (float): Factor converting stored values to reported units
+        """
+        pending = self._pending
+        pending.put((name, value, scale))
+        if pending.qsize() >= self.drain_threshold:
+            # Leave the drain to whoever already holds the lock
+            if self.lock.acquire(False):
+                try:
+                    self._drain()
+                finally:
+                    self.lock.release()
+                    
+    def _drain(self):
+        """
+        Move the queued values into storage. Implemented by subclasses.
         """
-        self.window_size = window_size
-        self.metrics: Dict[str, List[float]] = {}
-        self.start_times: Dict[str, float] = {}
-        self.lock = threading.RLock()
         
     def start_measurement(self, name: str):
         """
@@ -32,33 +95,24 @@ class PerformanceMonitor:
         Args:
             name (str): Name of the operation
         """
-        with self.lock:
-            self.start_times[name] = time.time()
+        self._start_times()[name] = time.perf_counter_ns()
         
     def end_measurement(self, name: str):
         """
         End measuring a named operation and record the duration.
+        Durations are stored as nanoseconds and reported in seconds.
         
         Args:
             name (str): Name of the operation
         """
-        with self.lock:
-            if name not in self.start_times:
-                logger.warning(f"No start time recorded for '{name}'")
-                return
-                
-            duration = time.time() - self.start_times[name]
-            
-            if name not in self.metrics:
-                self.metrics[name] = []
-                
-            self.metrics[name].append(duration)
+        end = time.perf_counter_ns()
+        start = self._start_times().pop(name, _MISSING)
+        if start is _MISSING:
+            logger.warning(f"No start time recorded for '{name}'")
+            return
             
-            if len(self.metrics[name]) > self.window_size:
-                self.metrics[name].pop(0)
-
-            del self.start_times[name]
-    
+        self._put(name, end - start, 1e-9)
+        
     def record_value(self, name: str, value: float):
         """
         Record a custom value metric.
@@ -67,74 +121,209 @@ class PerformanceMonitor:
             name (str): Name of the metric
             value (float): Value to record
         """
-        with self.lock:
-            if name not in self.metrics:
-                self.metrics[name] = []
-                
-            self.metrics[name].append(value)
+        self._put(name, value, 1.0)
+    
+    def measure(self, name: str) -> _PySpan:
+        """
+        Measure a block of code without going through the start times.
+        
+        Usage:
+            with monitor.measure("render"):
+                ...
+        
+        Args:
+            name (str): Name of the operation
+            
+        Returns:
+            _PySpan: Context manager recording the block's duration
+        """
+        return _PySpan(self, name)
+
+
+try:
+    from utils._perfmon import Recorder as _Recorder
+    PERFMON_EXTENSION = True
+except ImportError:
+    _Recorder = _PyRecorder
+    PERFMON_EXTENSION = False
+
 
-            if len(self.metrics[name]) > self.window_size:
-                self.metrics[name].pop(0)
+class PerformanceMonitor(_Recorder):
+    """
+    Tracks and reports performance metrics.
     
-    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+    Measurements are pushed onto a lock-free queue, so recording never
+    blocks; start times are kept per thread. Queued values are drained into
+    a columnar store - one row of a 2D array per metric - and the statistics
+    of every metric are computed together in a single vectorized pass. A
+    measurement must be started and ended on the same thread.
+    """
+    
+    def __init__(self, window_size: int = 100):
+        """
+        Initialize the performance monitor.
+        
+        Args:
+            window_size (int): Number of measurements to keep for each metric
         """
-        Get statistical metrics for all measurements.
+        self.window_size = window_size
+        self.drain_threshold = window_size
+        self._tls = threading.local()
+        self._pending = queue.SimpleQueue()
+        self._rows: Dict[str, int] = {}
+        self._buf = np.empty((0, window_size), dtype=np.float64)
+        self._head = np.zeros(0, dtype=np.intp)
+        self._count = np.zeros(0, dtype=np.intp)
+        self._scale = np.ones(0, dtype=np.float64)
+        self._cached_metrics = None
+        self.lock = RLock()
+        
+    def _add_row(self, name: str, scale: float) -> int:
+        """
+        Add a row to the store for a new metric.
         
+        Args:
+            name (str): Name of the metric
+            scale (float): Factor converting stored values to reported units
+            
         Returns:
-            Dict[str, Dict[str, float]]: Metrics with statistics
+            int: Index of the new row
         """
-        result = {}
+        row = len(self._rows)
+        self._buf = np.vstack((self._buf, np.full((1, self.window_size), np.nan)))
+        self._head = np.append(self._head, 0)
+        self._count = np.append(self._count, 0)
+        self._scale = np.append(self._scale, scale)
+        self._rows[name] = row
+        return row
         
-        with self.lock:
-            for name, values in self.metrics.items():
-                if not values:
-                    continue
-                    
-                try:
-                    result[name] = {
-                        "min": min(values),
-                        "max": max(values),
-                        "avg": sum(values) / len(values),
-                        "median": statistics.median(values),
-                        "p95": self._percentile(values, 95),
-                        "p99": self._percentile(values, 99),
-                        "count": len(values),
-                        "last": values[-1]
-                    }
-                except Exception as e:
-                    logger.error(f"Error calculating metrics for '{name}': {e}")
-                    result[name] = {"error": str(e)}
+    def _drain(self):
+        """
+        Move the queued values into the store.
+        Must be called with the lock held.
+        """
+        pending = self._pending
+        taken = pending.qsize()
+        if not taken:
+            return
+            
+        rows = self._rows
+        buf = self._buf
+        head = self._head
+        count = self._count
+        window_size = self.window_size
         
-        return result
+        for _ in range(taken):
+            name, value, scale = pending.get_nowait()
+            row = rows.get(name)
+            if row is None:
+                row = self._add_row(name, scale)
+                buf = self._buf
+                head = self._head
+                count = self._count
+            index = head[row]
+            buf[row, index] = value
+            head[row] = index + 1 if index + 1 < window_size else 0
+            if count[row] < window_size:
+                count[row] += 1
+                
+        self._cached_metrics = None
+        
+    def timed(self, name: str) -> Callable:
+        """
+        Decorator measuring every call of a function.
+        
+        Args:
+            name (str): Name of the operation
+            
+        Returns:
+            Callable: Decorator
+        """
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._put(name, time.perf_counter_ns() - start, 1e-9)
+            return wrapper
+        return decorator
     
-    def reset(self):
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
         """
-        Reset all metrics.
+        Get statistical metrics for all measurements, merged across threads.
+        
+        Returns:
+            Dict[str, Dict[str, float]]: Metrics with statistics
         """
         with self.lock:
-            self.metrics.clear()
-            self.start_times.clear()
+            self._drain()
+            if self._cached_metrics is None:
+                self._cached_metrics = self._compute_metrics()
+            return {name: dict(stats) for name, stats in self._cached_metrics.items()}
     
-    def _percentile(self, values: List[float], percentile: float) -> float:
+    def _compute_metrics(self) -> Dict[str, Dict[str, float]]:
         """
-        Calculate percentile value.
+        Compute the statistics of every metric in one pass over the store.
+        Must be called with the lock held.
         
-        Args:
-            values (List[float]): List of values
-            percentile (float): Percentile to calculate (0-100)
-            
         Returns:
-            float: Percentile value
+            Dict[str, Dict[str, float]]: Metrics with statistics
         """
-        values_sorted = sorted(values)
-        k = (len(values_sorted) - 1) * percentile / 100.0
-        f = int(k)
-        c = k - f
+        result = {}
+        if not self._rows:
+            return result
+            
+        try:
+            buf = self._buf
+            count = self._count
+            
+            if count.min() == self.window_size:
+                median, p95, p99 = np.percentile(buf, [50, 95, 99], axis=1)
+                stats = np.stack((buf.min(axis=1), buf.max(axis=1), buf.mean(axis=1),
+                                  median, p95, p99))
+            else:
+                # Unfilled slots hold NaN and are skipped by the nan-aware reductions
+                median, p95, p99 = np.nanpercentile(buf, [50, 95, 99], axis=1)
+                stats = np.stack((np.nanmin(buf, axis=1), np.nanmax(buf, axis=1),
+                                  np.nanmean(buf, axis=1), median, p95, p99))
+                                  
+            last = buf[np.arange(len(count)), self._head - 1]
+            table = (np.vstack((stats, last)) * self._scale).T.tolist()
+            counts = count.tolist()
+            
+            # Every row holds at least one value, so nothing below can fail per metric
+            for name, row in self._rows.items():
+                minimum, maximum, avg, median, p95, p99, last = table[row]
+                result[name] = {
+                    "min": minimum,
+                    "max": maximum,
+                    "avg": avg,
+                    "median": median,
+                    "p95": p95,
+                    "p99": p99,
+                    "last": last,
+                    "count": counts[row]
+                }
+        except Exception as e:
+            logger.error(f"Error calculating metrics: {e}")
         
-        if f + 1 < len(values_sorted):
-            return values_sorted[f] * (1 - c) + values_sorted[f + 1] * c
-        else:
-            return values_sorted[f]
+        return result
+    
+    def reset(self):
+        """
+        Reset all metrics.
+        """
+        with self.lock:
+            self._tls = threading.local()
+            self._pending = queue.SimpleQueue()
+            self._rows = {}
+            self._buf = np.empty((0, self.window_size), dtype=np.float64)
+            self._head = np.zeros(0, dtype=np.intp)
+            self._count = np.zeros(0, dtype=np.intp)
+            self._scale = np.ones(0, dtype=np.float64)
+            self._cached_metrics = None
 
 
 class MemoryMonitor:
@@ -150,42 +339,51 @@ class MemoryMonitor:
             interval (float): Monitoring interval in seconds
         """
         self.interval = interval
-        self.running = False
         self.monitor_thread = None
-        self.memory_usage = []
+        self._stop_evt = threading.Event()
         self.max_samples = 100
+        self._MB = 1.0 / (1024 * 1024)
+        # Replaced wholesale on each sample, so readers never see a partial update
+        self._samples: Tuple[float, ...] = ()
     
     def start(self):
         """
         Start memory monitoring in a background thread.
         """
-        if self.running:
+        if self.monitor_thread and self.monitor_thread.is_alive():
+            return
+            
+        if not PSUTIL_AVAILABLE:
+            logger.warning("psutil not available, memory monitoring disabled")
             return
             
-        self.running = True
+        self._stop_evt.clear()
+        
+        # Bind the method once so each sample skips the attribute lookups
+        get_memory_info = psutil.Process().memory_info
+        to_mb = self._MB
         
         def monitor_loop():
-            import psutil
-            import os
+            next_sample = time.monotonic()
             
-            process = psutil.Process(os.getpid())
-            
-            while self.running:
+            while True:
                 try:
-                    memory_info = process.memory_info()
-
-                    memory_mb = memory_info.rss / (1024 * 1024)
-                    self.memory_usage.append(memory_mb)
-
-                    if len(self.memory_usage) > self.max_samples:
-                        self.memory_usage.pop(0)
+                    memory_mb = get_memory_info().rss * to_mb
+                    samples = self._samples + (memory_mb,)
+                    if len(samples) > self.max_samples:
+                        samples = samples[1:]
+                    self._samples = samples
                         
-                    logger.debug(f"Current memory usage: {memory_mb:.2f} MB")
+                    logger.debug("Current memory usage: %.2f MB", memory_mb)
                     
                 except Exception as e:
                     logger.error(f"Error monitoring memory: {e}")
                     
-                time.sleep(self.interval)
+                # Keep a steady cadence regardless of how long sampling took,
+                # waking immediately when stop() is called
+                next_sample += self.interval
+                if self._stop_evt.wait(max(0.0, next_sample - time.monotonic())):
+                    break
 
         self.monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
         self.monitor_thread.start()
@@ -195,9 +393,10 @@ class MemoryMonitor:
         """
         Stop memory monitoring.
         """
-        self.running = False
+        self._stop_evt.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=1.0)
+            self.monitor_thread = None
             logger.info("Stopped memory monitoring")
     
     def get_usage(self) -> Dict[str, float]:
@@ -207,12 +406,13 @@ class MemoryMonitor:
         Returns:
             Dict[str, float]: Memory usage statistics in MB
         """
-        if not self.memory_usage:
+        samples = self._samples
+        if not samples:
             return {"current": 0, "avg": 0, "max": 0, "min": 0}
             
         return {
-            "current": self.memory_usage[-1],
-            "avg": sum(self.memory_usage) / len(self.memory_usage),
-            "max": max(self.memory_usage),
-            "min": min(self.memory_usage)
+            "current": samples[-1],
+            "avg": sum(samples) / len(samples),
+            "max": max(samples),
+            "min": min(samples)
         }
\ No newline at end of file
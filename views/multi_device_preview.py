@@ -7,6 +7,9 @@ import threading
 import logging
 import json
 import os
+from bisect import bisect_right
+from functools import lru_cache
+from collections import OrderedDict
 
 from models.light_effect import LightEffect
 from controllers.effect_manager import EffectManager
@@ -14,8 +17,204 @@ from services.clustering import ClusteringService
 from controllers.device_manager import DeviceManager
 from utils.color_utils import interpolate_color
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from utils._blend import blend_max
+    BLEND_EXTENSION = True
+except ImportError:
+    BLEND_EXTENSION = False
+
 logger = logging.getLogger(__name__)
 
+# Frames kept for the FPS and render time statistics, a power of two
+_STATS_WINDOW = 256
+
+# Milliseconds between refreshes of the FPS and render time lines of the stats overlay
+_STATS_REFRESH_MS = 250
+
+# Rendered text surfaces kept by MultiDevicePreview._render_text
+_TEXT_CACHE_SIZE = 512
+
+# LED colors are stored as little-endian uint32, i.e. RGBA bytes, black is 0xFF000000
+_LED_DTYPE = np.dtype("<u4")
+_OPAQUE_BLACK = 0xFF000000
+
+
+@lru_cache(maxsize=4096)
+def _led_glyph(packed_rgba: int, radius: int) -> pygame.Surface:
+    """
+    Get a prerendered LED circle, cached by packed color and radius.
+    
+    Args:
+        packed_rgba (int): Color packed as 0xAABBGGRR, an entry of the LED buffer
+        radius (int): Circle radius in pixels
+        
+    Returns:
+        pygame.Surface: Circle glyph of size (2 * radius + 1) squared
+    """
+    size = 2 * radius + 1
+    glyph = pygame.Surface((size, size), pygame.SRCALPHA)
+    color = (packed_rgba & 0xFF, (packed_rgba >> 8) & 0xFF, (packed_rgba >> 16) & 0xFF)
+    pygame.draw.circle(glyph, color, (radius, radius), radius)
+    # Match the display's pixel format so blitting needs no conversion
+    return glyph.convert_alpha()
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _blend_segments_kernel(out, prev, effect_colors, effect_offsets, effect_lengths,
+                               segment_ptr, segment_table, changed):
+        """
+        Max-blend every effect into every segment, one device per parallel iteration,
+        and flag the devices whose segments now differ from the previous frame.
+        
+        Args:
+            out (np.ndarray): Flat LED buffer of all devices, shape (N_leds, 4) (uint8 RGBA)
+            prev (np.ndarray): Previous frame in the same layout as out
+            effect_colors (np.ndarray): Concatenated effect outputs, shape (N_effect_leds, 3) (uint8)
+            effect_offsets (np.ndarray): Start row of each effect in effect_colors
+            effect_lengths (np.ndarray): Number of LEDs of each effect
+            segment_ptr (np.ndarray): Segment rows of device d are segment_ptr[d]:segment_ptr[d + 1]
+            segment_table (np.ndarray): Rows of (start, length, stop) in out
+            changed (np.ndarray): Set to 1 for each device with a changed LED, shape (N_devices,) (uint8)
+        """
+        for d in prange(len(segment_ptr) - 1):
+            for s in range(segment_ptr[d], segment_ptr[d + 1]):
+                start = segment_table[s, 0]
+                length = segment_table[s, 1]
+                stop = segment_table[s, 2]
+                for e in range(len(effect_offsets)):
+                    base = effect_offsets[e]
+                    count = effect_lengths[e]
+                    for i in range(stop - start):
+                        j = i * count // length
+                        if j > count - 1:
+                            j = count - 1
+                        for c in range(3):
+                            value = effect_colors[base + j, c]
+                            if value > out[start + i, c]:
+                                out[start + i, c] = value
+                                
+            # Compare once all segments of the device are blended, as segments may overlap
+            for s in range(segment_ptr[d], segment_ptr[d + 1]):
+                if changed[d]:
+                    break
+                for i in range(segment_table[s, 0], segment_table[s, 2]):
+                    if out[i, 0] != prev[i, 0] or out[i, 1] != prev[i, 1] or out[i, 2] != prev[i, 2]:
+                        changed[d] = 1
+                        break
+
+    @njit(cache=True)
+    def _screen_rects_kernel(world, zoom, pan_x, pan_y, radius, width, height, positions, rects, visible):
+        """
+        Transform LED world positions to screen positions, glyph rects and
+        window visibility in one pass.
+        
+        Args:
+            world (np.ndarray): World rects of all LEDs, shape (N, 4) (float32)
+            zoom (float): Current zoom
+            pan_x (float): Current horizontal pan
+            pan_y (float): Current vertical pan
+            radius (int): LED radius on screen
+            width (int): Window width
+            height (int): Window height
+            positions (np.ndarray): Output screen centers, shape (N, 2) (float32)
+            rects (np.ndarray): Output glyph rects, shape (N, 4) (int32)
+            visible (np.ndarray): Output visibility, shape (N,) (bool)
+        """
+        # Same float32 arithmetic as the NumPy path, so both give identical rects
+        zoom = np.float32(zoom)
+        pan_x = np.float32(pan_x)
+        pan_y = np.float32(pan_y)
+        size = radius * 2
+        for i in range(len(world)):
+            x = world[i, 0] * zoom + pan_x
+            y = world[i, 1] * zoom + pan_y
+            positions[i, 0] = x
+            positions[i, 1] = y
+            left = np.int32(x) - radius
+            top = np.int32(y) - radius
+            rects[i, 0] = left
+            rects[i, 1] = top
+            rects[i, 2] = size
+            rects[i, 3] = size
+            visible[i] = left > -size and left < width and top > -size and top < height
+
+    @njit(cache=True)
+    def _aabb(positions):
+        """
+        Get the bounding box of LED positions in one pass.
+        
+        Args:
+            positions (np.ndarray): LED positions, shape (N, 2) with N > 0
+            
+        Returns:
+            Tuple[float, float, float, float]: (min_x, min_y, max_x, max_y)
+        """
+        min_x = max_x = positions[0, 0]
+        min_y = max_y = positions[0, 1]
+        for i in range(1, len(positions)):
+            x = positions[i, 0]
+            y = positions[i, 1]
+            if x < min_x:
+                min_x = x
+            elif x > max_x:
+                max_x = x
+            if y < min_y:
+                min_y = y
+            elif y > max_y:
+                max_y = y
+        return min_x, min_y, max_x, max_y
+
+    def _prewarm_kernels():
+        """
+        Compile the per-view kernels for the dtypes the preview uses, so the
+        first frame does not stall on compilation.
+        """
+        world = np.zeros((1, 4), dtype=np.float32)
+        _screen_rects_kernel(world, 1.0, 0.0, 0.0, 1, 1, 1, np.empty((1, 2), dtype=np.float32),
+                             np.empty((1, 4), dtype=np.int32), np.empty(1, dtype=np.bool_))
+        _aabb(np.zeros((1, 2), dtype=np.float32))
+
+
+def _place_rect(rect: pygame.Rect, x: int, y: int, width: int, height: int) -> bool:
+    """
+    Move and resize a persistent rect in place.
+    
+    Args:
+        rect (pygame.Rect): Rect to update
+        x (int): New left edge
+        y (int): New top edge
+        width (int): New width
+        height (int): New height
+        
+    Returns:
+        bool: True if the rect changed
+    """
+    if rect.x == x and rect.y == y and rect.width == width and rect.height == height:
+        return False
+    rect.update(x, y, width, height)
+    return True
+
+
+class _SegmentUI:
+    """
+    Keys of the properties panel controls of one segment in ui_dropdowns,
+    ui_buttons and ui_sliders, built once per segment.
+    """
+    
+    __slots__ = ("dropdown_key", "apply_key", "slider_key")
+    
+    def __init__(self, segment_id: str):
+        self.dropdown_key = f"effect_dropdown_{segment_id}"
+        self.apply_key = f"apply_effect_{segment_id}"
+        self.slider_key = f"speed_slider_{segment_id}"
+
 
 class LayoutSettings:
     """
@@ -27,6 +226,7 @@ class LayoutSettings:
         """
         # Devices dictionary: {device_id: {name, led_count, position, rotation, color, segments}}
         self.devices = {}
+        self.devices_version = 0  # Bumped whenever devices are added, removed or loaded
         
         # Segments dictionary: {segment_id: {device_id, start, end, position, rotation}}
         self.segments = {}
@@ -96,6 +296,7 @@ class LayoutSettings:
                 data = json.load(f)
                 
             self.devices = data.get("devices", {})
+            self.devices_version += 1
             self.segments = data.get("segments", {})
             self.layout_type = data.get("layout_type", "custom")
             self.layout_params = data.get("layout_params", {})
@@ -141,6 +342,7 @@ class LayoutSettings:
             "color": color,
             "segments": []
         }
+        self.devices_version += 1
         
         logger.info(f"Added device {device_id} to layout")
         return True
@@ -215,6 +417,7 @@ class LayoutSettings:
                 
         # Remove the device
         del self.devices[device_id]
+        self.devices_version += 1
         
         logger.info(f"Removed device {device_id} from layout")
         return True
@@ -266,11 +469,10 @@ class MultiDevicePreview:
         self.device_manager = device_manager
         self.clustering_service = clustering_service
         
-        # Initialize settings
+        # Initialize settings; display settings are read from layout_settings
         self.layout_settings = LayoutSettings()
         self.width = 1200
         self.height = 800
-        self.background_color = (20, 20, 30)
         self.fps = 60
         
         self.led_size = 5
@@ -280,15 +482,21 @@ class MultiDevicePreview:
         self.zoom = 1.0
         self.pan_x = 0
         self.pan_y = 0
-        self.show_labels = True
         self.show_stats = True
         self.show_controls = True
-        self.show_grid = True
-        self.grid_size = 20
         
         # UI and interaction info
         self.screen = None
         self.font = None
+        self._text_cache = OrderedDict()  # {(text, color): Surface}, least recently used first
+        self._chrome_cache = {}  # {(part, size...): Surface} prerendered panel headers, frames and buttons
+        self._ui_key = None  # _ui_state() the UI was last drawn for
+        self._speed_segment = None  # effect segment whose move_speed the properties panel shows
+        self._effect_options = None  # (effects version, effect ids, dropdown options, {effect_id: option index})
+        self._segment_ui: Dict[str, _SegmentUI] = {}  # {segment_id: keys of its properties panel controls}
+        self._props_cache = {}  # {(kind, id): (shown values, property lines)} of the properties panel
+        self._device_rows = None  # (ids, names, colors, LED count texts) of the devices panel rows
+        self._device_rows_version = -1  # LayoutSettings.devices_version _device_rows was built for
         self.big_font = None
         self.clock = None
         self.running = False
@@ -303,19 +511,62 @@ class MultiDevicePreview:
         self.edit_mode = False
         
         # Performance tracking
-        self.fps_history = []
-        self.render_times = []
+        # Ring buffers of the last _STATS_WINDOW frames, written at _stats_idx
+        self._fps_buf = np.zeros(_STATS_WINDOW, dtype=np.float32)
+        self._render_buf = np.zeros(_STATS_WINDOW, dtype=np.float32)
+        self._stats_idx = 0
+        self._stats_lines = None  # FPS and render time lines, refreshed every _STATS_REFRESH_MS
+        self._stats_time = 0
         self.last_frame_time = 0
         
         # LED and segment data
-        self.device_positions = {}  # {device_id: [(x, y), ...]}
-        self.segment_positions = {}  # {segment_id: [(x, y), ...]}
-        self.led_colors = {}  # {device_id: [(r, g, b), ...]}
+        self.device_positions = {}  # {device_id: ndarray (N, 2) float32}
+        self.segment_positions = {}  # {segment_id: ndarray view (N, 2) float32}
+        self._device_bounds = {}  # {device_id: (min_x, min_y, max_x, max_y)} in world units
+        self._segment_bounds = {}  # {segment_id: (min_x, min_y, max_x, max_y)} in world units
+        self._device_to_segments = {}  # {device_id: (starts, [(start, end, segment_id)])} sorted by start
+        self.led_colors = {}  # {device_id: ndarray view (N, 3) uint8 into _led_buf}
+        self._led_buf_u32 = np.zeros(0, dtype=_LED_DTYPE)  # front buffer: all devices' colors, back to back
+        self._led_buf = self._led_buf_u32.view(np.uint8).reshape(0, 4)  # the same bytes as (N, 4) RGBA
+        self._led_back = (self._led_buf_u32, self._led_buf, self.led_colors)  # buffer being blended into
+        self._device_offset = {}  # {device_id: first row in _led_buf}
+        self._rects_world = np.zeros((0, 4), dtype=np.float32)  # (x, y, led_size, led_size) in _led_buf order
+        self._rects_screen = np.zeros((0, 4), dtype=np.int32)  # glyph rects on screen
+        self._screen_positions = np.zeros((0, 2), dtype=np.float32)  # LED centers on screen
+        self._visible = np.zeros(0, dtype=bool)  # LEDs whose glyph overlaps the window
+        self._led_blits = {}  # {device_id: [visible LEDs, their packed colors, blit list]} for the current view
+        self._screen_lists = {}  # {device_id: screen positions as a list} for the current view
+        self._box_rect = pygame.Rect(0, 0, 0, 0)  # reused for the boxes drawn by _draw_leds
+        self._row_rect = pygame.Rect(0, 0, 0, 0)  # reused for the rows, options and slider parts of the panels
+        self._list_rect = pygame.Rect(0, 0, 0, 0)  # reused for the option list of an open dropdown
+        self._content_rect = pygame.Rect(0, 0, 0, 0)  # reused for the content area passed to the panel drawers
+        self._status_rect = pygame.Rect(0, 0, 0, 0)  # reused for the status bar
+        self._grid_surface = None  # background with grid lines, one cell larger than the window
+        self._grid_key = None  # (spacing, width, height, background_color) _grid_surface was drawn for
+        self._view_key = None  # (zoom, pan_x, pan_y, width, height, radius) _rects_screen was computed for
+        self._redraw_all = True  # whole window must be presented on the next frame
+        self._leds_changed = False  # LED colors were swapped in since the last frame
+        self._dirty_rects: List[pygame.Rect] = []  # screen areas to present when only the LEDs changed
+        self._device_dirty_rects: List[pygame.Rect] = []  # reused by _draw_leds, one per visible device
+        self._idx_cache: Dict[Tuple[int, int], np.ndarray] = {}  # {(segment_length, effect_led_count): index map}
+        self._idx_cache_segments = 0
+        self._seg_table = np.zeros((0, 3), dtype=np.int64)  # (start, length, stop) of each segment in _led_buf
+        self._seg_ptr = np.zeros(1, dtype=np.int64)  # segments of device d are _seg_table[_seg_ptr[d]:_seg_ptr[d + 1]]
+        self._gather = np.empty((0, 3), dtype=np.uint8)  # reused effect colors gathered for one segment
+        self._dir_cache: Dict[Tuple[float, int, int], np.ndarray] = {}  # {(rotation, led_size, led_spacing): LED step}
+        self._led_hash = None  # {cell: [(device_id, led_idx, x, y)]} for selection, built on demand
+        self._led_hash_cell = 0.0
+        self._positions_dirty = False  # regenerate positions after this frame's events
         
         # UI tools
         self.tools = ["pan", "select", "add_device", "add_segment", "edit", "delete"]
         self.current_tool = "pan"
         self.tool_buttons = {}  # {tool: rect}
+        self._tool_rects_arr = None  # (N, 4) int32 rects of tool_buttons, rebuilt when a button moves
+        self._tool_keys = []
+        self._tool_icons = {}  # {tool: 30x30 icon surface}, rendered once in initialize
+        self._arrow_surf = None  # dropdown arrow, rendered once in initialize
+        self._stats_bg = None  # translucent stats background, rendered once in initialize
         
         # UI panels
         self.panels = {
@@ -324,15 +575,24 @@ class MultiDevicePreview:
             "devices": pygame.Rect(10, self.height - 210, 300, 200),
             "effects": pygame.Rect(self.width - 310, 10, 300, 300)
         }
+        # {panel_id: (title, content drawer)} of the panels drawn by _draw_panels
+        self._panel_views = {
+            "properties": ("Properties", self._draw_properties_panel),
+            "devices": ("Devices", self._draw_devices_panel),
+            "effects": ("Effects", self._draw_effects_panel)
+        }
         self.collapsed_panels = set()
         self.minimized_panels = set()
         self.dragging_panel = None
         self.drag_offset = (0, 0)
         
         # UI controls
-        self.ui_buttons = {}  # {button_id: {rect, text, active, hover}}
-        self.ui_dropdowns = {}  # {dropdown_id: {rect, options, selected_index, open, hover_index}}
-        self.ui_sliders = {}  # {slider_id: {rect, min_value, max_value, value, dragging}}
+        self.ui_buttons = {}  # {button_id: {rect, text, active, hover, kind, segment_id}}
+        self.ui_dropdowns = {}  # {dropdown_id: {rect, options, selected_index, open, hover_index, kind, segment_id, effect_ids}}
+        self.ui_sliders = {}  # {slider_id: {rect, min_value, max_value, value, dragging, kind, segment_id, dropdown_id}}
+        self._ui_list: List[Tuple[str, str, Dict[str, Any]]] = []  # (type, element_id, element) of every control
+        self._ui_hash = None  # {(x >> 6, y >> 6): [index into _ui_list]}, rebuilt when controls change
+        self._hovered_buttons = set()
         
         # Context menu
         self.context_menu = None  # {rect, options, hover_index}
@@ -342,7 +602,52 @@ class MultiDevicePreview:
         self.status_text = ""
         
         # Thread lock
-        self.lock = threading.RLock()
+        self.lock = threading.Lock()
+        self._swap_lock = threading.Lock()  # guards flipping the front and back LED buffers
+    
+    @property
+    def background_color(self) -> Tuple[int, int, int]:
+        """
+        Background color, stored in the layout settings.
+        """
+        return self.layout_settings.background_color
+        
+    @background_color.setter
+    def background_color(self, value: Tuple[int, int, int]):
+        self.layout_settings.background_color = value
+        
+    @property
+    def grid_size(self) -> int:
+        """
+        Grid spacing in world units, stored in the layout settings.
+        """
+        return self.layout_settings.grid_size
+        
+    @grid_size.setter
+    def grid_size(self, value: int):
+        self.layout_settings.grid_size = value
+        
+    @property
+    def show_grid(self) -> bool:
+        """
+        Whether the grid is drawn, stored in the layout settings.
+        """
+        return self.layout_settings.show_grid
+        
+    @show_grid.setter
+    def show_grid(self, value: bool):
+        self.layout_settings.show_grid = value
+        
+    @property
+    def show_labels(self) -> bool:
+        """
+        Whether labels are drawn, stored in the layout settings.
+        """
+        return self.layout_settings.show_labels
+        
+    @show_labels.setter
+    def show_labels(self, value: bool):
+        self.layout_settings.show_labels = value
     
     def initialize(self):
         """
@@ -351,6 +656,9 @@ class MultiDevicePreview:
         if self.screen is not None:
             return
             
+        # Dùng bộ trộn alpha của SDL2, nhanh hơn trên các máy blit bằng phần mềm
+        os.environ.setdefault("PYGAME_BLEND_ALPHA_SDL2", "1")
+        
         pygame.init()
         pygame.display.set_caption("LED Multi-Device Preview")
         self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
@@ -358,11 +666,32 @@ class MultiDevicePreview:
         self.font = pygame.font.Font(None, 24)
         self.big_font = pygame.font.Font(None, 36)
         
+        # Chỉ nhận các loại sự kiện được xử lý, SDL bỏ qua phần còn lại
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([
+            pygame.QUIT, pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.KEYDOWN,
+            pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION
+        ])
+        self._redraw_all = True
+        
+        if NUMBA_AVAILABLE:
+            _prewarm_kernels()
+        
         # Initialize tool positions
         tool_y = 20
         for tool in self.tools:
             self.tool_buttons[tool] = pygame.Rect(20, tool_y, 30, 30)
             tool_y += 40
+        self._tool_rects_arr = None
+        self._build_tool_icons()
+        
+        # Mũi tên của dropdown, vẽ một lần
+        arrow = pygame.Surface((11, 7), pygame.SRCALPHA)
+        pygame.draw.polygon(arrow, (200, 200, 200), [(0, 0), (10, 0), (5, 6)])
+        self._arrow_surf = arrow.convert_alpha()
+        
+        # Nền bán trong suốt của bảng thống kê (5 dòng)
+        self._stats_bg = self._make_stats_bg(5)
         
         # Create default layout if none exists
         if not self.layout_settings.devices:
@@ -399,7 +728,9 @@ class MultiDevicePreview:
         """
         with self.lock:
             self.device_positions = {}
-            self.segment_positions = {}
+            self._device_bounds = {}
+            device_slices = {}
+            offset = 0
             
             # Calculate LED positions for each device
             for device_id, device_info in self.layout_settings.devices.items():
@@ -407,85 +738,283 @@ class MultiDevicePreview:
                 device_pos = device_info["position"]
                 rotation = device_info["rotation"]
                 
-                # Create default positions for all LEDs in the device
-                positions = []
-                
-                for i in range(led_count):
-                    # Position LEDs in a horizontal line
-                    x = device_pos[0] + i * (self.led_size + self.led_spacing) * math.cos(math.radians(rotation))
-                    y = device_pos[1] + i * (self.led_size + self.led_spacing) * math.sin(math.radians(rotation))
-                    positions.append((x, y))
+                # Position LEDs along a line in the device's direction, all at once
+                key = (rotation, self.led_size, self.led_spacing)
+                direction = self._dir_cache.get(key)
+                if direction is None:
+                    theta = math.radians(rotation)
+                    step = self.led_size + self.led_spacing
+                    direction = np.array([math.cos(theta), math.sin(theta)], dtype=np.float32) * step
+                    self._dir_cache[key] = direction
+                offsets = np.arange(led_count, dtype=np.float32)[:, None] * direction
+                positions = offsets + np.asarray(device_pos, dtype=np.float32)
                     
                 self.device_positions[device_id] = positions
+                if led_count > 0:
+                    self._device_bounds[device_id] = self._bounds(positions)
                 
-                # Initialize LED colors as black
-                self.led_colors[device_id] = [(0, 0, 0)] * led_count
+                device_slices[device_id] = (offset, led_count)
+                offset += led_count
                 
-            # Create LED positions for each segment
-            for segment_id, segment_info in self.layout_settings.segments.items():
-                device_id = segment_info["device_id"]
-                start = segment_info["start"]
-                end = segment_info["end"]
-                
-                if device_id in self.device_positions:
-                    device_positions = self.device_positions[device_id]
-                    if 0 <= start < end < len(device_positions):
-                        self.segment_positions[segment_id] = device_positions[start:end+1]
+            # Initialize LED colors as black, in front and back buffers holding
+            # all devices back to back
+            total = offset
+            front = self._new_led_buffer(total, device_slices)
+            back = self._new_led_buffer(total, device_slices)
+            with self._swap_lock:
+                self._device_offset = {device_id: start for device_id, (start, _) in device_slices.items()}
+                self._led_buf_u32, self._led_buf, self.led_colors = front
+                self._led_back = back
+                
+            # The LED spatial hash is rebuilt on the next selection
+            self._led_hash = None
+            
+            # World rects of all LEDs in buffer order; screen rects follow on the next draw
+            self._rects_world = np.empty((total, 4), dtype=np.float32)
+            if self.device_positions:
+                self._rects_world[:, :2] = np.concatenate(list(self.device_positions.values()))
+            self._rects_world[:, 2:] = self.led_size
+            self._view_key = None
+            self._redraw_all = True
+            
+            self._build_segments()
+            
+    def _generate_segments(self):
+        """
+        Regenerate segment data only, after segments were added or removed
+        without changing any device.
+        """
+        with self.lock:
+            self._build_segments()
+            
+    def _build_segments(self):
+        """
+        Build segment positions, bounds and the numeric segment table from the
+        current device positions. Must be called with the lock held.
+        """
+        self.segment_positions = {}
+        self._segment_bounds = {}
+        device_slices = {
+            device_id: (self._device_offset[device_id], len(positions))
+            for device_id, positions in self.device_positions.items()
+        }
+        
+        # Drop cached index maps when segments were added or removed
+        if len(self.layout_settings.segments) != self._idx_cache_segments:
+            self._idx_cache.clear()
+            self._idx_cache_segments = len(self.layout_settings.segments)
+            
+        # Create LED positions for each segment (views into the device positions)
+        for segment_id, segment_info in self.layout_settings.segments.items():
+            device_id = segment_info["device_id"]
+            start = segment_info["start"]
+            end = segment_info["end"]
+            
+            if device_id in self.device_positions:
+                device_positions = self.device_positions[device_id]
+                if 0 <= start < end < len(device_positions):
+                    self.segment_positions[segment_id] = device_positions[start:end+1]
+                if 0 <= start <= end < len(device_positions):
+                    self._segment_bounds[segment_id] = self._bounds(device_positions[start:end+1])
+                    
+        # Segments of each device sorted by start, for bisecting in _select_at_position
+        device_segments = {}
+        for segment_id, segment_info in self.layout_settings.segments.items():
+            device_segments.setdefault(segment_info["device_id"], []).append(
+                (segment_info["start"], segment_info["end"], segment_id)
+            )
+        self._device_to_segments = {}
+        for device_id, segments in device_segments.items():
+            segments.sort(key=lambda segment: segment[0])
+            self._device_to_segments[device_id] = ([segment[0] for segment in segments], segments)
+                    
+        # Numeric segment table for the blend, grouped by device so the parallel
+        # kernel can give each device's LEDs to one thread
+        segment_rows = {device_id: [] for device_id in device_slices}
+        for segment_info in self.layout_settings.segments.values():
+            device_id = segment_info["device_id"]
+            start = segment_info["start"]
+            end = segment_info["end"]
+            
+            if device_id not in segment_rows or start < 0 or start > end:
+                continue
+                
+            offset, led_count = device_slices[device_id]
+            stop = min(end + 1, led_count)
+            if start < stop:
+                segment_rows[device_id].append((offset + start, end - start + 1, offset + stop))
+                
+        self._seg_table = np.array(
+            [row for rows in segment_rows.values() for row in rows], dtype=np.int64
+        ).reshape(-1, 3)
+        self._seg_ptr = np.zeros(len(segment_rows) + 1, dtype=np.int64)
+        np.cumsum([len(rows) for rows in segment_rows.values()], out=self._seg_ptr[1:])
     
+    def _bounds(self, positions: np.ndarray) -> Tuple[float, float, float, float]:
+        """
+        Get the bounding box of LED positions.
+        
+        Args:
+            positions (np.ndarray): LED positions, shape (N, 2) with N > 0
+            
+        Returns:
+            Tuple[float, float, float, float]: (min_x, min_y, max_x, max_y)
+        """
+        if NUMBA_AVAILABLE:
+            return _aabb(positions)
+            
+        min_x, min_y = positions.min(axis=0).tolist()
+        max_x, max_y = positions.max(axis=0).tolist()
+        return min_x, min_y, max_x, max_y
+        
+    def _new_led_buffer(self, total: int, device_slices: Dict[str, Tuple[int, int]]) -> Tuple:
+        """
+        Allocate a black color buffer for all devices.
+        
+        Args:
+            total (int): Number of LEDs of all devices
+            device_slices (Dict[str, Tuple[int, int]]): (offset, led_count) of each device
+            
+        Returns:
+            Tuple: Packed uint32 colors, their (N, 4) RGBA view and the (N, 3) RGB view of each device
+        """
+        led_buf_u32 = np.full(total, _OPAQUE_BLACK, dtype=_LED_DTYPE)
+        led_buf = led_buf_u32.view(np.uint8).reshape(total, 4)
+        led_colors = {
+            device_id: led_buf[offset:offset + led_count, :3]
+            for device_id, (offset, led_count) in device_slices.items()
+        }
+        return led_buf_u32, led_buf, led_colors
+        
     def update_led_colors(self):
         """
         Update LED colors from active effects.
         """
+        # Snapshot the layout and effects, then blend without holding the lock
         with self.lock:
-            # Set all LEDs to black
-            for device_id, positions in self.device_positions.items():
-                self.led_colors[device_id] = [(0, 0, 0)] * len(positions)
+            offsets = self._device_offset
+            front_u32, front_buf = self._led_buf_u32, self._led_buf
+            back = self._led_back
+            seg_ptr = self._seg_ptr
+            seg_table = self._seg_table
+            effects = dict(self.effect_manager.effects)
+            active_effect_ids = list(self.effect_manager.active_effect_ids)
+            
+        # Set all LEDs to black in the back buffer, the renderer only reads the front one
+        led_buf_u32, led_buf, led_colors = back
+        led_buf_u32.fill(_OPAQUE_BLACK)
+        
+        # Get colors from active effects, once per effect for all segments
+        outputs = []
+        for effect_id in active_effect_ids:
+            effect = effects.get(effect_id)
+            if effect is None:
+                continue
+            effect_colors = np.asarray(effect.get_led_output(), dtype=np.uint8).reshape(-1, 3)
+            if len(effect_colors):
+                outputs.append(effect_colors)
                 
-            # Get colors from active effects
-            effects = self.effect_manager.effects
-            active_effect_ids = self.effect_manager.active_effect_ids
-            
-            for effect_id in active_effect_ids:
-                if effect_id not in effects:
-                    continue
-                    
-                effect = effects[effect_id]
+        if outputs and len(seg_table) and NUMBA_AVAILABLE:
+            changed = self._blend_with_kernel(led_buf, front_buf, seg_ptr, seg_table, outputs)
+        else:
+            segment_rows = seg_table.tolist()
+            for effect_colors in outputs:
+                effect_led_count = len(effect_colors)
                 
                 # Apply colors from effects to segments
-                for segment_id, segment_info in self.layout_settings.segments.items():
-                    device_id = segment_info["device_id"]
-                    start = segment_info["start"]
-                    end = segment_info["end"]
-                    
-                    if device_id not in self.led_colors:
-                        continue
-                        
-                    # Get effect output colors
-                    effect_colors = effect.get_led_output()
-                    effect_led_count = len(effect_colors)
-                    
-                    if effect_led_count == 0:
-                        continue
-                    
+                for start, segment_length, stop in segment_rows:
                     # Map colors from effect to segment
-                    segment_length = end - start + 1
+                    effect_idx = self._segment_index_map(segment_length, effect_led_count)
                     
-                    for i in range(segment_length):
-                        # Map index from segment to effect
-                        effect_idx = min(int(i * effect_led_count / segment_length), effect_led_count - 1)
+                    # Combine colors (take max value)
+                    if BLEND_EXTENSION:
+                        blend_max(led_buf[start:stop], effect_colors, effect_idx)
+                    else:
+                        # Gather into a reused buffer instead of allocating per segment
+                        count = stop - start
+                        if len(self._gather) < count:
+                            self._gather = np.empty((count, 3), dtype=np.uint8)
+                        gathered = self._gather[:count]
+                        np.take(effect_colors, effect_idx[:count], axis=0, out=gathered)
+                        target = led_buf[start:stop, :3]
+                        np.maximum(target, gathered, out=target)
                         
-                        if effect_idx < len(effect_colors):
-                            # Combine colors (take max value)
-                            led_idx = start + i
-                            if led_idx < len(self.led_colors[device_id]):
-                                current_color = self.led_colors[device_id][led_idx]
-                                effect_color = effect_colors[effect_idx]
-                                
-                                self.led_colors[device_id][led_idx] = (
-                                    max(current_color[0], effect_color[0]),
-                                    max(current_color[1], effect_color[1]),
-                                    max(current_color[2], effect_color[2])
-                                )
+            changed = self._segments_changed(led_buf_u32, front_u32, segment_rows)
+                    
+        # Flip the buffers, skipping the swap if the layout was regenerated while blending
+        # or if no LED changed color, so unchanged frames are not redrawn
+        with self._swap_lock:
+            if changed and offsets is self._device_offset:
+                self._led_back = (self._led_buf_u32, self._led_buf, self.led_colors)
+                self._led_buf_u32, self._led_buf, self.led_colors = back
+                self._leds_changed = True
+            
+    def _blend_with_kernel(self, led_buf: np.ndarray, front_buf: np.ndarray, seg_ptr: np.ndarray,
+                           seg_table: np.ndarray, outputs: List[np.ndarray]) -> bool:
+        """
+        Blend active effects into the flat LED buffer with the compiled kernel.
+        
+        Args:
+            led_buf (np.ndarray): Flat LED buffer of all devices, shape (N_leds, 4) (RGBA)
+            front_buf (np.ndarray): Front buffer holding the previous frame, same layout as led_buf
+            seg_ptr (np.ndarray): Segment rows of device d are seg_ptr[d]:seg_ptr[d + 1]
+            seg_table (np.ndarray): Rows of (start, length, stop) of each segment in led_buf
+            outputs (List[np.ndarray]): Non-empty output colors of each active effect, shape (N, 3)
+            
+        Returns:
+            bool: True if any LED differs from the previous frame
+        """
+        effect_lengths = np.array([len(colors) for colors in outputs], dtype=np.int64)
+        effect_offsets = np.zeros_like(effect_lengths)
+        np.cumsum(effect_lengths[:-1], out=effect_offsets[1:])
+        
+        changed = np.zeros(len(seg_ptr) - 1, dtype=np.uint8)
+        _blend_segments_kernel(
+            led_buf, front_buf, np.concatenate(outputs), effect_offsets, effect_lengths,
+            seg_ptr, seg_table, changed
+        )
+        return bool(changed.any())
+        
+    def _segments_changed(self, led_buf_u32: np.ndarray, front_u32: np.ndarray,
+                          segment_rows: List[List[int]]) -> bool:
+        """
+        Check whether any segment LED differs from the previous frame.
+        LEDs outside the segments are never blended and stay black in both buffers,
+        so only the segment rows are compared, stopping at the first change.
+        
+        Args:
+            led_buf_u32 (np.ndarray): Blended frame, packed uint32
+            front_u32 (np.ndarray): Front buffer holding the previous frame, same layout
+            segment_rows (List[List[int]]): Rows of (start, length, stop) of each segment
+            
+        Returns:
+            bool: True if any LED differs from the previous frame
+        """
+        for start, _, stop in segment_rows:
+            if not np.array_equal(led_buf_u32[start:stop], front_u32[start:stop]):
+                return True
+        return False
+    
+    def _segment_index_map(self, segment_length: int, effect_led_count: int) -> np.ndarray:
+        """
+        Get the effect LED index for each LED of a segment, cached by shape.
+        
+        Args:
+            segment_length (int): Number of LEDs in the segment
+            effect_led_count (int): Number of LEDs in the effect output
+            
+        Returns:
+            np.ndarray: Effect LED index for each segment LED
+        """
+        key = (segment_length, effect_led_count)
+        effect_idx = self._idx_cache.get(key)
+        if effect_idx is None:
+            effect_idx = np.minimum(
+                np.arange(segment_length, dtype=np.intp) * effect_led_count // segment_length,
+                effect_led_count - 1
+            )
+            self._idx_cache[key] = effect_idx
+        return effect_idx
     
     def run(self):
         """
@@ -520,7 +1049,23 @@ class MultiDevicePreview:
         """
         Process pygame events.
         """
-        for event in pygame.event.get():
+        motion = None
+        
+        # Mọi sự kiện (kể cả VIDEOEXPOSE) có thể làm thay đổi giao diện
+        events = pygame.event.get()
+        if events:
+            self._redraw_all = True
+            
+        for event in events:
+            # Gộp các sự kiện di chuyển chuột liên tiếp thành một
+            if event.type == pygame.MOUSEMOTION:
+                motion = self._merge_motion(motion, event)
+                continue
+                
+            if motion is not None:
+                self._handle_mouse_motion(motion)
+                motion = None
+                
             if event.type == pygame.QUIT:
                 self.running = False
                 
@@ -542,8 +1087,34 @@ class MultiDevicePreview:
             elif event.type == pygame.MOUSEBUTTONUP:
                 self._handle_mouse_button_up(event)
                 
-            elif event.type == pygame.MOUSEMOTION:
-                self._handle_mouse_motion(event)
+        if motion is not None:
+            self._handle_mouse_motion(motion)
+            
+        # Cập nhật vị trí LED một lần mỗi frame
+        if self._positions_dirty:
+            self._positions_dirty = False
+            self._generate_positions()
+            
+    def _merge_motion(self, motion, event):
+        """
+        Merge a mouse motion event into the pending one of this frame.
+        
+        Args:
+            motion (pygame.event.Event): Pending motion event, or None
+            event (pygame.event.Event): New motion event
+            
+        Returns:
+            pygame.event.Event: Motion to the latest position, with the summed movement
+        """
+        if motion is None:
+            return event
+            
+        return pygame.event.Event(
+            pygame.MOUSEMOTION,
+            pos=event.pos,
+            rel=(motion.rel[0] + event.rel[0], motion.rel[1] + event.rel[1]),
+            buttons=event.buttons
+        )
 
     def _handle_key_event(self, event):
         """
@@ -591,10 +1162,10 @@ class MultiDevicePreview:
         mouse_pos = event.pos
         
         # Kiểm tra xem có nhấp vào nút công cụ không
-        for tool, rect in self.tool_buttons.items():
-            if rect.collidepoint(mouse_pos):
-                self.current_tool = tool
-                return
+        tool = self._tool_at(mouse_pos)
+        if tool is not None:
+            self.current_tool = tool
+            return
         
         # Kiểm tra tương tác với UI controls (buttons, dropdowns, sliders)
         if self._handle_ui_controls(event):
@@ -661,6 +1232,31 @@ class MultiDevicePreview:
             self.zoom /= 1.1
             self._update_zoom(mouse_pos)
 
+    def _tool_at(self, position):
+        """
+        Find the tool button under a position, testing all buttons at once.
+        
+        Args:
+            position (tuple): Screen position
+            
+        Returns:
+            str: Tool under the position, or None
+        """
+        if self._tool_rects_arr is None:
+            self._tool_keys = list(self.tool_buttons.keys())
+            self._tool_rects_arr = np.array(
+                [[rect.x, rect.y, rect.width, rect.height] for rect in self.tool_buttons.values()],
+                dtype=np.int32
+            ).reshape(-1, 4)
+            
+        rects = self._tool_rects_arr
+        x, y = position
+        hits = np.flatnonzero((x >= rects[:, 0]) & (x < rects[:, 0] + rects[:, 2]) &
+                              (y >= rects[:, 1]) & (y < rects[:, 1] + rects[:, 3]))
+        if len(hits):
+            return self._tool_keys[hits[0]]
+        return None
+
     def _handle_mouse_button_up(self, event):
         """
         Handle mouse button up events.
@@ -716,8 +1312,8 @@ class MultiDevicePreview:
                 device_info["position"][1] + mouse_rel[1] / self.zoom
             )
             
-            # Cập nhật vị trí LED
-            self._generate_positions()
+            # Cập nhật vị trí LED ở cuối frame
+            self._positions_dirty = True
     def _handle_ui_controls(self, event):
         """
         Handle interaction with UI controls like buttons, dropdowns, sliders.
@@ -732,73 +1328,45 @@ class MultiDevicePreview:
         
         # Xử lý click chuột
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            # Kiểm tra tương tác với các dropdown
-            for dropdown_id, dropdown in self.ui_dropdowns.items():
-                dropdown_rect = dropdown["rect"]
-                
-                # Kiểm tra click vào dropdown
-                if dropdown_rect.collidepoint(mouse_pos):
-                    dropdown["open"] = not dropdown["open"]
-                    # Đóng tất cả dropdown khác
-                    for other_id, other_dropdown in self.ui_dropdowns.items():
-                        if other_id != dropdown_id:
-                            other_dropdown["open"] = False
-                    return True
-                    
-                # Nếu dropdown đang mở, kiểm tra click vào các option
-                if dropdown["open"]:
-                    option_height = dropdown_rect.height
-                    options = dropdown["options"]
-                    list_height = min(len(options) * option_height, 5 * option_height)
-                    list_rect = pygame.Rect(dropdown_rect.x, dropdown_rect.bottom, dropdown_rect.width, list_height)
-                    
-                    if list_rect.collidepoint(mouse_pos):
-                        # Tính option index dựa trên vị trí chuột
-                        option_idx = int((mouse_pos[1] - list_rect.y) // option_height)
-                        if 0 <= option_idx < len(options) and option_idx < 5:  # Giới hạn 5 options hiển thị
-                            # Cập nhật option đã chọn
-                            dropdown["selected_index"] = option_idx
-                            dropdown["open"] = False
+            # Khi có dropdown đang mở, mọi click đều thuộc về các dropdown
+            if any(dropdown["open"] for dropdown in self.ui_dropdowns.values()):
+                return self._handle_open_dropdowns_click(mouse_pos)
+                
+            # Chỉ kiểm tra các control trong ô lưới chứa chuột, theo thứ tự dropdown, nút, slider
+            ui_list = self._ui_list
+            for index in self._get_ui_hash().get((mouse_pos[0] >> 6, mouse_pos[1] >> 6), ()):
+                element_type, element_id, element = ui_list[index]
+                if element_type == "dropdown":
+                    # Kiểm tra click vào dropdown
+                    if element["rect"].collidepoint(mouse_pos):
+                        element["open"] = True
+                        return True
+                        
+                elif element_type == "button":
+                    # Kiểm tra tương tác với các nút
+                    if element["rect"].collidepoint(mouse_pos):
+                        element["active"] = True
+                        
+                        # Nếu đây là nút áp dụng hiệu ứng
+                        if element.get("kind") == "apply_effect":
+                            self._apply_effect_to_segment(element["segment_id"])
                             
-                            # Nếu đây là dropdown hiệu ứng, cập nhật UI
-                            if dropdown_id.startswith("effect_dropdown_"):
-                                segment_id = dropdown_id.split("_")[-1]
-                                self._update_selected_effect(segment_id, dropdown["selected_index"])
-                                
-                            return True
-                    else:
-                        # Click ngoài dropdown list nhưng dropdown đang mở
-                        dropdown["open"] = False
                         return True
-            
-            # Kiểm tra tương tác với các nút
-            for button_id, button in self.ui_buttons.items():
-                button_rect = button["rect"]
-                
-                if button_rect.collidepoint(mouse_pos):
-                    button["active"] = True
-                    
-                    # Nếu đây là nút áp dụng hiệu ứng
-                    if button_id.startswith("apply_effect_"):
-                        segment_id = button_id.split("_")[-1]
-                        self._apply_effect_to_segment(segment_id)
                         
-                    return True
-            
-            # Kiểm tra tương tác với các slider
-            for slider_id, slider in self.ui_sliders.items():
-                slider_rect = slider["rect"]
-                
-                # Tính vị trí handle của slider
-                handle_pos = slider_rect.x + ((slider["value"] - slider["min_value"]) / 
-                                            (slider["max_value"] - slider["min_value"])) * slider_rect.width
-                handle_rect = pygame.Rect(handle_pos - 5, slider_rect.y - 5, 10, 20)
-                
-                if slider_rect.collidepoint(mouse_pos) or handle_rect.collidepoint(mouse_pos):
-                    slider["dragging"] = True
-                    # Cập nhật giá trị ngay lập tức
-                    self._update_slider_value(slider_id, mouse_pos[0])
-                    return True
+                else:
+                    # Kiểm tra tương tác với các slider
+                    slider = element
+                    slider_rect = slider["rect"]
+                    
+                    # Tính vị trí handle của slider
+                    handle_pos = self._slider_handle_x(slider)
+                    handle_rect = pygame.Rect(handle_pos - 5, slider_rect.y - 5, 10, 20)
+                    
+                    if slider_rect.collidepoint(mouse_pos) or handle_rect.collidepoint(mouse_pos):
+                        slider["dragging"] = True
+                        # Cập nhật giá trị ngay lập tức
+                        self._update_slider_value(element_id, mouse_pos[0])
+                        return True
         
         # Xử lý thả chuột
         elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
@@ -838,21 +1406,34 @@ class MultiDevicePreview:
                 slider["dragging"] = False
         
         # Xử lý di chuyển chuột
+        # Thứ tự từ trên xuống: context menu, dropdown đang mở, slider đang kéo, nút;
+        # dừng ở vùng đầu tiên nhận sự kiện
         elif event.type == pygame.MOUSEMOTION:
-            handled = False
-            
-            # Cập nhật hover trạng thái cho các nút
-            for button_id, button in self.ui_buttons.items():
-                old_hover = button.get("hover", False)
-                new_hover = button["rect"].collidepoint(mouse_pos)
+            # Cập nhật hover index cho context menu
+            if self.context_menu:
+                menu_rect = self.context_menu["rect"]
+                
+                old_hover_index = self.context_menu.get("hover_index", -1)
+                new_hover_index = -1
+                
+                if menu_rect.collidepoint(mouse_pos):
+                    option_height = 25
+                    option_idx = int((mouse_pos[1] - menu_rect.y - 5) // option_height)
+                    
+                    if 0 <= option_idx < len(self.context_menu["options"]):
+                        new_hover_index = option_idx
                 
-                if old_hover != new_hover:
-                    button["hover"] = new_hover
+                handled = self._set_hovered_buttons(set())
+                if old_hover_index != new_hover_index:
+                    self.context_menu["hover_index"] = new_hover_index
                     handled = True
+                return handled
                 
             # Cập nhật hover index cho các dropdown đang mở
-            for dropdown_id, dropdown in self.ui_dropdowns.items():
-                if dropdown["open"]:
+            open_dropdowns = [dropdown for dropdown in self.ui_dropdowns.values() if dropdown["open"]]
+            if open_dropdowns:
+                handled = self._set_hovered_buttons(set())
+                for dropdown in open_dropdowns:
                     dropdown_rect = dropdown["rect"]
                     option_height = dropdown_rect.height
                     options = dropdown["options"]
@@ -870,35 +1451,148 @@ class MultiDevicePreview:
                     if old_hover_index != new_hover_index:
                         dropdown["hover_index"] = new_hover_index
                         handled = True
+                return handled
             
             # Cập nhật giá trị cho slider đang được kéo
+            dragging = False
             for slider_id, slider in self.ui_sliders.items():
                 if slider["dragging"]:
                     self._update_slider_value(slider_id, mouse_pos[0])
-                    handled = True
-            
-            # Cập nhật hover index cho context menu
-            if hasattr(self, 'context_menu') and self.context_menu:
-                menu_rect = self.context_menu["rect"]
-                
-                old_hover_index = self.context_menu.get("hover_index", -1)
-                new_hover_index = -1
-                
-                if menu_rect.collidepoint(mouse_pos):
-                    option_height = 25
-                    option_idx = int((mouse_pos[1] - menu_rect.y - 5) // option_height)
+                    dragging = True
+            if dragging:
+                return True
+            
+            # Cập nhật hover trạng thái cho các nút, chỉ các nút trong ô lưới chứa chuột
+            ui_list = self._ui_list
+            hovered = set()
+            for index in self._get_ui_hash().get((mouse_pos[0] >> 6, mouse_pos[1] >> 6), ()):
+                element_type, element_id, element = ui_list[index]
+                if element_type == "button" and element["rect"].collidepoint(mouse_pos):
+                    hovered.add(element_id)
                     
-                    if 0 <= option_idx < len(self.context_menu["options"]):
-                        new_hover_index = option_idx
+            return self._set_hovered_buttons(hovered)
+            
+        return False
+        
+    def _set_hovered_buttons(self, hovered) -> bool:
+        """
+        Set the hover state of the buttons, touching only the buttons whose
+        state can change: the newly hovered and the previously hovered ones.
+        
+        Args:
+            hovered (set): IDs of the buttons under the mouse
+            
+        Returns:
+            bool: True if the hover state of any button changed
+        """
+        changed = False
+        for button_id in hovered | self._hovered_buttons:
+            button = self.ui_buttons.get(button_id)
+            if button is None:
+                continue
                 
-                if old_hover_index != new_hover_index:
-                    self.context_menu["hover_index"] = new_hover_index
-                    handled = True
-                    
-            return handled
+            new_hover = button_id in hovered
+            if button.get("hover", False) != new_hover:
+                button["hover"] = new_hover
+                changed = True
+        self._hovered_buttons = hovered
+        return changed
+        
+    def _handle_open_dropdowns_click(self, mouse_pos):
+        """
+        Handle a click while a dropdown is open: pick an option, toggle a
+        dropdown or close the open one.
+        
+        Args:
+            mouse_pos (Tuple[int, int]): Mouse position
+            
+        Returns:
+            bool: True if event was handled
+        """
+        # Kiểm tra tương tác với các dropdown
+        for dropdown_id, dropdown in self.ui_dropdowns.items():
+            dropdown_rect = dropdown["rect"]
+            
+            # Kiểm tra click vào dropdown
+            if dropdown_rect.collidepoint(mouse_pos):
+                dropdown["open"] = not dropdown["open"]
+                # Đóng tất cả dropdown khác
+                for other_id, other_dropdown in self.ui_dropdowns.items():
+                    if other_id != dropdown_id:
+                        other_dropdown["open"] = False
+                return True
+                
+            # Nếu dropdown đang mở, kiểm tra click vào các option
+            if dropdown["open"]:
+                option_height = dropdown_rect.height
+                options = dropdown["options"]
+                list_height = min(len(options) * option_height, 5 * option_height)
+                list_rect = pygame.Rect(dropdown_rect.x, dropdown_rect.bottom, dropdown_rect.width, list_height)
+                
+                if list_rect.collidepoint(mouse_pos):
+                    # Tính option index dựa trên vị trí chuột
+                    option_idx = int((mouse_pos[1] - list_rect.y) // option_height)
+                    if 0 <= option_idx < len(options) and option_idx < 5:  # Giới hạn 5 options hiển thị
+                        # Cập nhật option đã chọn
+                        dropdown["selected_index"] = option_idx
+                        dropdown["open"] = False
+                        
+                        # Nếu đây là dropdown hiệu ứng, cập nhật UI
+                        if dropdown.get("kind") == "effect":
+                            self._update_selected_effect(dropdown["segment_id"], dropdown["selected_index"])
+                            
+                        return True
+                else:
+                    # Click ngoài dropdown list nhưng dropdown đang mở
+                    dropdown["open"] = False
+                    return True
             
         return False
         
+    def _get_ui_hash(self) -> Dict[Tuple[int, int], List[int]]:
+        """
+        Get the 64 px screen grid of UI controls, rebuilding it and _ui_list
+        after controls were added or moved.
+        
+        Returns:
+            Dict[Tuple[int, int], List[int]]: Indices into _ui_list of the controls overlapping each cell
+        """
+        if self._ui_hash is not None:
+            return self._ui_hash
+            
+        ui_list = []
+        ui_hash = {}
+        for element_type, elements in (("dropdown", self.ui_dropdowns), ("button", self.ui_buttons),
+                                       ("slider", self.ui_sliders)):
+            for element_id, element in elements.items():
+                index = len(ui_list)
+                ui_list.append((element_type, element_id, element))
+                rect = element["rect"]
+                if element_type == "slider":
+                    # Cover the handle, which reaches 5 px past the bar on every side
+                    rect = pygame.Rect(rect.x - 5, rect.y - 5, rect.width + 10, max(rect.height + 10, 20))
+                for cx in range(rect.left >> 6, ((rect.right - 1) >> 6) + 1):
+                    for cy in range(rect.top >> 6, ((rect.bottom - 1) >> 6) + 1):
+                        ui_hash.setdefault((cx, cy), []).append(index)
+                        
+        self._ui_list = ui_list
+        self._ui_hash = ui_hash
+        return ui_hash
+        
+    def _slider_handle_x(self, slider) -> float:
+        """
+        Get the x position of a slider's handle.
+        
+        Args:
+            slider (dict): Slider from ui_sliders
+            
+        Returns:
+            float: Screen x of the handle center
+        """
+        rect = slider["rect"]
+        min_value = slider["min_value"]
+        return rect.x + (slider["value"] - min_value) / (slider["max_value"] - min_value) * rect.width
+        
     def _update_slider_value(self, slider_id, x_pos):
         """
         Update slider value based on x position.
@@ -921,14 +1615,11 @@ class MultiDevicePreview:
         slider["value"] = value
         
         # Nếu là slider tốc độ, áp dụng cho hiệu ứng đã chọn
-        if slider_id.startswith("speed_slider_"):
-            segment_id = slider_id.split("_")[-1]
-            dropdown_id = f"effect_dropdown_{segment_id}"
-            
-            if dropdown_id in self.ui_dropdowns:
-                dropdown = self.ui_dropdowns[dropdown_id]
+        if slider.get("kind") == "speed":
+            dropdown = self.ui_dropdowns.get(slider["dropdown_id"])
+            if dropdown is not None:
                 if dropdown["selected_index"] > 0:  # Nếu không phải "None"
-                    effect_id = list(self.effect_manager.effects.keys())[dropdown["selected_index"] - 1]
+                    effect_id = dropdown["effect_ids"][dropdown["selected_index"]]
                     if effect_id in self.effect_manager.effects:
                         effect = self.effect_manager.effects[effect_id]
                         # Cập nhật move_speed cho tất cả segment trong hiệu ứng
@@ -946,20 +1637,31 @@ class MultiDevicePreview:
             position (Tuple[int, int]): Screen position
         """
         # Chuyển đổi vị trí màn hình sang vị trí thế giới
-        world_pos = (
-            (position[0] - self.pan_x) / self.zoom,
-            (position[1] - self.pan_y) / self.zoom
-        )
+        inv_zoom = 1.0 / self.zoom
+        wx = (position[0] - self.pan_x) * inv_zoom
+        wy = (position[1] - self.pan_y) * inv_zoom
         
-        # Tìm LED gần nhất
-        min_distance = float('inf')
+        # Tìm LED gần nhất, chỉ trong các ô lân cận của spatial hash
+        hit_radius = 10.0 * inv_zoom
+        min_distance = hit_radius * hit_radius
         nearest_device = None
         nearest_led_idx = None
         
-        for device_id, led_positions in self.device_positions.items():
-            for led_idx, led_pos in enumerate(led_positions):
-                distance = math.sqrt((world_pos[0] - led_pos[0])**2 + (world_pos[1] - led_pos[1])**2)
-                if distance < min_distance and distance < 10 / self.zoom:
+        # Cell size is the hit radius rounded up to a power of two, so the
+        # hash is only rebuilt when the zoom changes by a factor of two
+        cell = 2.0 ** math.ceil(math.log2(hit_radius))
+        led_hash = self._get_led_hash(cell)
+        cx = math.floor(wx / cell)
+        cy = math.floor(wy / cell)
+        
+        for key in ((cx - 1, cy - 1), (cx, cy - 1), (cx + 1, cy - 1),
+                    (cx - 1, cy), (cx, cy), (cx + 1, cy),
+                    (cx - 1, cy + 1), (cx, cy + 1), (cx + 1, cy + 1)):
+            for device_id, led_idx, x, y in led_hash.get(key, ()):
+                dx = wx - x
+                dy = wy - y
+                distance = dx * dx + dy * dy
+                if distance < min_distance:
                     min_distance = distance
                     nearest_device = device_id
                     nearest_led_idx = led_idx
@@ -967,11 +1669,12 @@ class MultiDevicePreview:
         # Tìm segment chứa LED đã chọn
         nearest_segment = None
         if nearest_device and nearest_led_idx is not None:
-            for segment_id, segment_info in self.layout_settings.segments.items():
-                if segment_info["device_id"] == nearest_device:
-                    if segment_info["start"] <= nearest_led_idx <= segment_info["end"]:
-                        nearest_segment = segment_id
-                        break
+            starts, segments = self._device_to_segments.get(nearest_device, ((), ()))
+            # Đi lùi từ segment cuối cùng bắt đầu trước LED
+            for i in range(bisect_right(starts, nearest_led_idx) - 1, -1, -1):
+                if segments[i][1] >= nearest_led_idx:
+                    nearest_segment = segments[i][2]
+                    break
         
         # Cập nhật lựa chọn
         self.selected_device = nearest_device
@@ -980,6 +1683,29 @@ class MultiDevicePreview:
         
         logger.debug(f"Selected: Device={nearest_device}, Segment={nearest_segment}, LED={nearest_led_idx}")
     
+    def _get_led_hash(self, cell: float) -> Dict[Tuple[int, int], List[Tuple[str, int, float, float]]]:
+        """
+        Get the spatial hash of all LEDs for a cell size, building it on first use.
+        
+        Args:
+            cell (float): Cell size in world units
+            
+        Returns:
+            Dict[Tuple[int, int], List[Tuple[str, int, float, float]]]: (device_id, led_idx, x, y) of the LEDs in each cell
+        """
+        if self._led_hash is not None and self._led_hash_cell == cell:
+            return self._led_hash
+            
+        led_hash = {}
+        for device_id, led_positions in self.device_positions.items():
+            cells = np.floor(led_positions / cell).astype(np.int64).tolist()
+            for led_idx, ((cx, cy), (x, y)) in enumerate(zip(cells, led_positions.tolist())):
+                led_hash.setdefault((cx, cy), []).append((device_id, led_idx, x, y))
+                
+        self._led_hash = led_hash
+        self._led_hash_cell = cell
+        return led_hash
+    
     def _add_device_at_position(self, position):
         """
         Add a new device at the given position.
@@ -1067,8 +1793,8 @@ class MultiDevicePreview:
         # Thêm segment mới
         self.layout_settings.add_segment(segment_id, self.selected_device, start_led, end_led, world_pos, rotation)
         
-        # Cập nhật vị trí LED
-        self._generate_positions()
+        # Cập nhật dữ liệu segment, vị trí LED không đổi
+        self._generate_segments()
         
         # Chọn segment mới
         self.selected_segment = segment_id
@@ -1091,6 +1817,9 @@ class MultiDevicePreview:
             logger.info(f"Deleted segment {self.selected_segment}")
             self.selected_segment = None
             
+            # Cập nhật dữ liệu segment, vị trí LED không đổi
+            self._generate_segments()
+            
         elif self.selected_device:
             # Xóa thiết bị đã chọn
             self.layout_settings.remove_device(self.selected_device)
@@ -1098,8 +1827,8 @@ class MultiDevicePreview:
             self.selected_device = None
             self.selected_led = None
             
-        # Cập nhật vị trí LED
-        self._generate_positions()
+            # Cập nhật vị trí LED
+            self._generate_positions()
     
     def _update(self):
         """
@@ -1116,13 +1845,33 @@ class MultiDevicePreview:
         dt = current_time - self.last_frame_time
         self.last_frame_time = current_time
         
-        self.render_times.append(dt * 1000)
-        self.fps_history.append(self.clock.get_fps())
+        slot = self._stats_idx & (_STATS_WINDOW - 1)
+        self._render_buf[slot] = dt * 1000
+        self._fps_buf[slot] = self.clock.get_fps()
+        self._stats_idx += 1
+
+    def _render_text(self, text: str, color) -> pygame.Surface:
+        """
+        Render text with the UI font, reusing the surface of recent identical renders.
         
-        if len(self.render_times) > 60:
-            self.render_times.pop(0)
-        if len(self.fps_history) > 60:
-            self.fps_history.pop(0)
+        Args:
+            text (str): Text to render
+            color (tuple): Text color
+            
+        Returns:
+            pygame.Surface: Rendered text
+        """
+        key = (text, tuple(color))
+        surface = self._text_cache.get(key)
+        if surface is not None:
+            self._text_cache.move_to_end(key)
+            return surface
+            
+        surface = self.font.render(text, True, color).convert_alpha()
+        self._text_cache[key] = surface
+        if len(self._text_cache) > _TEXT_CACHE_SIZE:
+            self._text_cache.popitem(last=False)
+        return surface
 
     def _draw_context_menu(self):
         """
@@ -1141,8 +1890,9 @@ class MultiDevicePreview:
         
         # Vẽ các option
         option_height = 25
+        option_rect = self._row_rect
         for i, (option_text, _) in enumerate(options):
-            option_rect = pygame.Rect(
+            option_rect.update(
                 menu_rect.x, menu_rect.y + 5 + i * option_height, 
                 menu_rect.width, option_height
             )
@@ -1152,91 +1902,196 @@ class MultiDevicePreview:
                 pygame.draw.rect(self.screen, (70, 70, 90), option_rect)
             
             # Vẽ text
-            text_surface = self.font.render(option_text, True, (220, 220, 220))
+            text_surface = self._render_text(option_text, (220, 220, 220))
             self.screen.blit(text_surface, (option_rect.x + 10, option_rect.y + 5))
 
+    def _ui_state(self) -> Tuple:
+        """
+        Get the values shown by the tools and panels that can change without
+        an event, e.g. while effects run or from another thread.
+        
+        Returns:
+            Tuple: Window size, effect list, active effects, segment count of
+            every effect, devices version, current effect of the selected
+            segment and the shown speed
+        """
+        effect_manager = self.effect_manager
+        
+        current_effect = None
+        if self.selected_segment and self.device_manager:
+            segment = self.device_manager.segments.get(self.selected_segment)
+            if segment is not None:
+                current_effect = segment.effect_id
+                
+        speed_segment = self._speed_segment
+        
+        return (
+            self.width, self.height,
+            effect_manager.effects_version,
+            frozenset(effect_manager.active_effect_ids),
+            tuple(len(effect.segments) for effect in effect_manager.effects.values()),
+            self.layout_settings.devices_version,
+            current_effect,
+            speed_segment.move_speed if speed_segment is not None else None
+        )
+        
     def _render(self):
         """
         Render the preview.
+        
+        Frames where nothing changed are skipped. When only the LED colors
+        changed, the frame is redrawn but only the areas of the visible
+        devices, the stats and the status bar are presented.
         """
-        self.screen.fill(self.background_color)
+        # Giao diện đổi mà không có sự kiện (hiệu ứng, tốc độ...) cũng cần vẽ lại
+        if self._ui_state() != self._ui_key:
+            self._redraw_all = True
+            
+        if not (self._redraw_all or self._leds_changed):
+            return
+            
+        self._dirty_rects.clear()
         
-        # Vẽ lưới nếu được bật
+        # Vẽ lưới nếu được bật, lưới đã gồm cả nền
         if self.show_grid:
             self._draw_grid()
+        else:
+            self.screen.fill(self.background_color)
             
         # Vẽ tất cả LED
         self._draw_leds()
         
-        # Vẽ thanh công cụ
+        # Vẽ thanh công cụ, các panel UI và context menu
         self._draw_tools()
-        
-        # Vẽ các panel UI
         self._draw_panels()
-        
-        # Vẽ context menu nếu có
         self._draw_context_menu()
+        self._ui_key = self._ui_state()
         
         # Vẽ thông tin trạng thái
         if self.show_stats:
             self._draw_stats()
         
         # Vẽ thanh trạng thái
-        status_rect = pygame.Rect(0, self.height - self.status_bar_height, self.width, self.status_bar_height)
+        status_rect = self._status_rect
+        status_rect.update(0, self.height - self.status_bar_height, self.width, self.status_bar_height)
         pygame.draw.rect(self.screen, (40, 40, 50), status_rect)
         pygame.draw.line(self.screen, (100, 100, 120), (0, self.height - self.status_bar_height), 
                         (self.width, self.height - self.status_bar_height), 1)
         
         # Vẽ text trạng thái
         if self.status_text:
-            status_surface = self.font.render(self.status_text, True, (220, 220, 220))
+            status_surface = self._render_text(self.status_text, (220, 220, 220))
             self.screen.blit(status_surface, (10, self.height - self.status_bar_height + 5))
         
         # Vẽ hiện tại tool
         tool_text = f"Tool: {self.current_tool.replace('_', ' ').title()}"
-        tool_surface = self.font.render(tool_text, True, (220, 220, 220))
+        tool_surface = self._render_text(tool_text, (220, 220, 220))
         self.screen.blit(tool_surface, (self.width - tool_surface.get_width() - 10, 
                                     self.height - self.status_bar_height + 5))
-                
-        pygame.display.flip()
+        
+        if self._redraw_all:
+            pygame.display.flip()
+        else:
+            self._dirty_rects.append(status_rect)
+            pygame.display.update(self._dirty_rects)
+        self._redraw_all = False
+        self._leds_changed = False
 
     def _draw_grid(self):
         """
-        Draw grid lines.
+        Draw the background with grid lines.
+        
+        The grid is drawn once per spacing and window size onto a surface one
+        cell larger than the window, which is then blitted at the pan offset.
         """
         # Tính toán khoảng cách lưới dựa trên zoom
         grid_spacing = self.grid_size * self.zoom
-        
+        step = int(grid_spacing)
+        if step <= 0:
+            self.screen.fill(self.background_color)
+            return
+            
+        key = (step, self.width, self.height, tuple(self.background_color))
+        if key != self._grid_key:
+            width = self.width + step
+            height = self.height + step
+            surface = pygame.Surface((width, height))
+            surface.fill(self.background_color)
+            
+            # Vẽ các đường dọc
+            for x in range(0, width + 1, step):
+                pygame.draw.line(surface, (40, 40, 50), (x, 0), (x, height), 1)
+                
+            # Vẽ các đường ngang
+            for y in range(0, height + 1, step):
+                pygame.draw.line(surface, (40, 40, 50), (0, y), (width, y), 1)
+                
+            self._grid_surface = surface.convert()
+            self._grid_key = key
+            
         # Tính toán lưới đầu tiên hiển thị
         start_x = self.pan_x % grid_spacing
         start_y = self.pan_y % grid_spacing
-        
-        # Vẽ các đường dọc
-        for x in range(int(start_x), self.width + 1, int(grid_spacing)):
-            pygame.draw.line(self.screen, (40, 40, 50), (x, 0), (x, self.height), 1)
-            
-        # Vẽ các đường ngang
-        for y in range(int(start_y), self.height + 1, int(grid_spacing)):
-            pygame.draw.line(self.screen, (40, 40, 50), (0, y), (self.width, y), 1)
+        self.screen.blit(self._grid_surface, (int(start_x) - step, int(start_y) - step))
             
     def _draw_leds(self):
         """
         Draw all LEDs based on layout.
         """
+        # The packed colors double as the keys of the glyph cache
+        with self._swap_lock:
+            all_packed = self._led_buf_u32
+            device_offset = self._device_offset
+        
+        # Tính kích thước LED dựa trên zoom
+        zoom = self.zoom
+        pan_x = self.pan_x
+        pan_y = self.pan_y
+        led_size = max(1, self.led_size * zoom)
+        radius = int(led_size)
+        self._update_screen_rects(radius)
+        
+        # Boxes reach led_size past the LEDs, and their labels 25 px further
+        margin = max(self.led_size, radius) + 25
+        
+        # Dưới 2 pixel, một glyph chỉ còn là một chấm
+        tiny_leds = self.led_size * zoom < 2
+        
         # Vẽ tất cả LEDs dựa trên vị trí và màu sắc
+        device_dirty_rects = self._device_dirty_rects
+        dirty_count = 0
         for device_id, positions in self.device_positions.items():
-            colors = self.led_colors.get(device_id, [(0, 0, 0)] * len(positions))
+            offset = device_offset.get(device_id, 0)
+            stop = offset + len(positions)
+            packed_colors = all_packed[offset:stop]
             device_info = self.layout_settings.devices.get(device_id)
             
             if not device_info:
                 continue
                 
+            # Bỏ qua thiết bị nằm ngoài khung nhìn (kể cả nhãn phía trên/dưới hộp)
+            bounds = self._device_bounds.get(device_id)
+            if bounds is None or not self._box_in_view(bounds, zoom, pan_x, pan_y, margin):
+                continue
+                
+            # Vùng màn hình của thiết bị, kể cả hộp và nhãn
+            min_x = int(bounds[0] * zoom + pan_x - margin)
+            min_y = int(bounds[1] * zoom + pan_y - margin)
+            if dirty_count == len(device_dirty_rects):
+                device_dirty_rects.append(pygame.Rect(0, 0, 0, 0))
+            dirty_rect = device_dirty_rects[dirty_count]
+            dirty_count += 1
+            dirty_rect.update(
+                min_x, min_y,
+                int(bounds[2] * zoom + pan_x + margin) - min_x + 1,
+                int(bounds[3] * zoom + pan_y + margin) - min_y + 1
+            )
+            self._dirty_rects.append(dirty_rect)
+                
             # Vẽ đường kết nối giữa các LED
-            screen_positions = []
-            for pos in positions:
-                screen_x = pos[0] * self.zoom + self.pan_x
-                screen_y = pos[1] * self.zoom + self.pan_y
-                screen_positions.append((screen_x, screen_y))
+            screen_positions = self._screen_lists.get(device_id)
+            if screen_positions is None:
+                screen_positions = self._screen_lists[device_id] = self._screen_positions[offset:stop].tolist()
                 
             if len(screen_positions) > 1:
                 pygame.draw.lines(self.screen, (60, 60, 70), False, screen_positions, 1)
@@ -1244,12 +2099,13 @@ class MultiDevicePreview:
             # Vẽ hộp thiết bị nếu được bật
             if self.layout_settings.show_device_boxes:
                 # Xác định hình chữ nhật bao quanh tất cả LED của thiết bị
-                min_x = min(p[0] for p in screen_positions) - self.led_size
-                min_y = min(p[1] for p in screen_positions) - self.led_size
-                max_x = max(p[0] for p in screen_positions) + self.led_size
-                max_y = max(p[1] for p in screen_positions) + self.led_size
+                min_x = bounds[0] * zoom + pan_x - self.led_size
+                min_y = bounds[1] * zoom + pan_y - self.led_size
+                max_x = bounds[2] * zoom + pan_x + self.led_size
+                max_y = bounds[3] * zoom + pan_y + self.led_size
                 
-                device_rect = pygame.Rect(min_x, min_y, max_x - min_x, max_y - min_y)
+                device_rect = self._box_rect
+                device_rect.update(min_x, min_y, max_x - min_x, max_y - min_y)
                 device_color = device_info.get("color", (200, 200, 200))
                 
                 # Vẽ hộp thiết bị với màu nhạt
@@ -1259,7 +2115,7 @@ class MultiDevicePreview:
                 # Vẽ nhãn thiết bị nếu được bật
                 if self.layout_settings.show_labels:
                     device_name = device_info.get("name", f"Device {device_id}")
-                    name_surface = self.font.render(device_name, True, device_color)
+                    name_surface = self._render_text(device_name, device_color)
                     self.screen.blit(name_surface, (min_x, min_y - 25))
             
             # Vẽ từng segment
@@ -1267,23 +2123,19 @@ class MultiDevicePreview:
                 if segment_info["device_id"] != device_id:
                     continue
                 
-                start = segment_info["start"]
-                end = segment_info["end"]
-                
-                if start < 0 or end >= len(positions) or start > end:
+                bounds = self._segment_bounds.get(segment_id)
+                if bounds is None or not self._box_in_view(bounds, zoom, pan_x, pan_y, margin):
                     continue
                 
-                # Lấy vị trí màn hình cho segment
-                segment_positions = screen_positions[start:end+1]
-                
                 # Vẽ hộp segment nếu được bật
                 if self.layout_settings.show_segment_boxes:
-                    min_x = min(p[0] for p in segment_positions) - self.led_size
-                    min_y = min(p[1] for p in segment_positions) - self.led_size
-                    max_x = max(p[0] for p in segment_positions) + self.led_size
-                    max_y = max(p[1] for p in segment_positions) + self.led_size
+                    min_x = bounds[0] * zoom + pan_x - self.led_size
+                    min_y = bounds[1] * zoom + pan_y - self.led_size
+                    max_x = bounds[2] * zoom + pan_x + self.led_size
+                    max_y = bounds[3] * zoom + pan_y + self.led_size
                     
-                    segment_rect = pygame.Rect(min_x, min_y, max_x - min_x, max_y - min_y)
+                    segment_rect = self._box_rect
+                    segment_rect.update(min_x, min_y, max_x - min_x, max_y - min_y)
                     
                     # Highlight segment đã chọn
                     if segment_id == self.selected_segment:
@@ -1295,35 +2147,158 @@ class MultiDevicePreview:
                     # Vẽ nhãn segment nếu được bật
                     if self.layout_settings.show_labels:
                         segment_name = f"Segment {segment_id}"
-                        name_surface = self.font.render(segment_name, True, (180, 180, 200))
+                        name_surface = self._render_text(segment_name, (180, 180, 200))
                         self.screen.blit(name_surface, (min_x, max_y + 5))
             
             # Vẽ các LED
-            for i, (pos, color) in enumerate(zip(positions, colors)):
-                screen_x = pos[0] * self.zoom + self.pan_x
-                screen_y = pos[1] * self.zoom + self.pan_y
-                
-                # Tính kích thước LED dựa trên zoom
-                led_size = max(1, self.led_size * self.zoom)
-                
-                # Highlight LED đã chọn
-                if device_id == self.selected_device and i == self.selected_led:
-                    highlight_rect = pygame.Rect(
-                        screen_x - led_size - 2, 
-                        screen_y - led_size - 2,
-                        led_size * 2 + 4,
-                        led_size * 2 + 4
-                    )
-                    pygame.draw.rect(self.screen, (255, 255, 0), highlight_rect, 2)
-                
-                # Vẽ LED với màu thích hợp
-                pygame.draw.circle(self.screen, color, (int(screen_x), int(screen_y)), int(led_size))
-                
-                # Vẽ số thứ tự LED nếu được bật và zoom đủ lớn
-                if self.layout_settings.show_labels and self.zoom > 0.5 and i % 10 == 0:
-                    led_label = self.font.render(str(i), True, (150, 150, 150))
+            # LED nhỏ hơn 2 pixel được ghi thẳng vào pixel của màn hình
+            if not (tiny_leds and self._draw_led_pixels(packed_colors, offset, stop)):
+                self._blit_leds(device_id, packed_colors, offset, stop, radius)
+            
+            # Highlight LED đã chọn
+            if device_id == self.selected_device and self.selected_led is not None \
+                    and 0 <= self.selected_led < len(screen_positions):
+                screen_x, screen_y = screen_positions[self.selected_led]
+                highlight_rect = self._box_rect
+                highlight_rect.update(
+                    screen_x - led_size - 2, 
+                    screen_y - led_size - 2,
+                    led_size * 2 + 4,
+                    led_size * 2 + 4
+                )
+                pygame.draw.rect(self.screen, (255, 255, 0), highlight_rect, 2)
+                
+            # Vẽ số thứ tự LED nếu được bật và zoom đủ lớn
+            if self.layout_settings.show_labels and self.zoom > 0.5:
+                visible_leds = self._visible[offset:stop]
+                for i in range(0, len(screen_positions), 10):
+                    if not visible_leds[i]:
+                        continue
+                    screen_x, screen_y = screen_positions[i]
+                    led_label = self._render_text(str(i), (150, 150, 150))
                     self.screen.blit(led_label, (screen_x + led_size + 2, screen_y - 10))
     
+    def _blit_leds(self, device_id: int, packed_colors: np.ndarray, offset: int, stop: int, radius: int):
+        """
+        Draw the visible LEDs of a device as cached glyphs in one blits() call.
+        The blit list is kept between frames and only the glyphs of LEDs whose
+        color changed are replaced.
+        
+        Args:
+            device_id (int): ID of the device
+            packed_colors (np.ndarray): Packed RGBA colors of the device's LEDs (uint32)
+            offset (int): First LED of the device in the master buffer
+            stop (int): End of the device's LEDs in the master buffer
+            radius (int): LED radius on screen
+        """
+        cached = self._led_blits.get(device_id)
+        if cached is None:
+            visible = np.flatnonzero(self._visible[offset:stop])
+            colors = packed_colors[visible]
+            blits = [
+                (_led_glyph(packed, radius), rect)
+                for packed, rect in zip(colors.tolist(), self._rects_screen[offset:stop][visible].tolist())
+            ]
+            self._led_blits[device_id] = [visible, colors, blits]
+        else:
+            # Chỉ cập nhật các LED đã đổi màu
+            visible, previous, blits = cached
+            colors = packed_colors[visible]
+            changed = np.flatnonzero(colors != previous)
+            for i, packed in zip(changed.tolist(), colors[changed].tolist()):
+                blits[i] = (_led_glyph(packed, radius), blits[i][1])
+            cached[1] = colors
+        self.screen.blits(blits, doreturn=False)
+        
+    def _draw_led_pixels(self, packed_colors: np.ndarray, offset: int, stop: int) -> bool:
+        """
+        Write the visible LEDs of a device straight into the screen pixels,
+        one pixel per LED, for zoom levels where a glyph would be under 2 px.
+        
+        Args:
+            packed_colors (np.ndarray): Packed RGBA colors of the device's LEDs (uint32)
+            offset (int): First LED of the device in the master buffer
+            stop (int): End of the device's LEDs in the master buffer
+            
+        Returns:
+            bool: False if the screen format has no pixel array, so the caller
+                  should fall back to glyphs
+        """
+        centers = self._screen_positions[offset:stop].astype(np.intp)
+        x = centers[:, 0]
+        y = centers[:, 1]
+        inside = np.flatnonzero((x >= 0) & (x < self.width) & (y >= 0) & (y < self.height))
+        if not len(inside):
+            return True
+            
+        try:
+            pixels = pygame.surfarray.pixels3d(self.screen)
+        except (ValueError, pygame.error):
+            return False
+            
+        # Cùng thứ tự kênh với _led_glyph: byte thấp nhất là đỏ
+        rgba = packed_colors.view(np.uint8).reshape(-1, 4)
+        try:
+            pixels[x[inside], y[inside]] = rgba[inside, :3]
+        finally:
+            # Giải phóng khóa của surface
+            del pixels
+        return True
+    
+    def _box_in_view(self, bounds: Tuple[float, float, float, float], zoom: float,
+                     pan_x: float, pan_y: float, margin: float) -> bool:
+        """
+        Check whether a world-space box, grown by a screen margin, overlaps the
+        view above the status bar.
+        
+        Args:
+            bounds (Tuple[float, float, float, float]): (min_x, min_y, max_x, max_y) in world units
+            zoom (float): Current zoom
+            pan_x (float): Current horizontal pan
+            pan_y (float): Current vertical pan
+            margin (float): Margin in pixels
+            
+        Returns:
+            bool: True if the box is at least partly visible
+        """
+        return (bounds[0] * zoom + pan_x - margin < self.width and
+                bounds[2] * zoom + pan_x + margin > 0 and
+                bounds[1] * zoom + pan_y - margin < self.height - self.status_bar_height and
+                bounds[3] * zoom + pan_y + margin > 0)
+    
+    def _update_screen_rects(self, radius: int):
+        """
+        Recompute the screen positions, glyph rects and visibility of all LEDs,
+        only when the zoom, pan, window size or LED radius changed since the
+        last call.
+        
+        Args:
+            radius (int): LED radius on screen
+        """
+        view_key = (self.zoom, self.pan_x, self.pan_y, self.width, self.height, radius)
+        if view_key == self._view_key:
+            return
+            
+        world = self._rects_world
+        if NUMBA_AVAILABLE:
+            self._screen_positions = np.empty((len(world), 2), dtype=np.float32)
+            self._rects_screen = np.empty(world.shape, dtype=np.int32)
+            self._visible = np.empty(len(world), dtype=bool)
+            _screen_rects_kernel(world, float(self.zoom), float(self.pan_x), float(self.pan_y), radius,
+                                 self.width, self.height, self._screen_positions, self._rects_screen,
+                                 self._visible)
+        else:
+            self._screen_positions = world[:, :2] * self.zoom + np.array([self.pan_x, self.pan_y], dtype=np.float32)
+            rects = np.empty(world.shape, dtype=np.int32)
+            rects[:, :2] = self._screen_positions.astype(np.int32) - radius
+            rects[:, 2:] = radius * 2
+            self._rects_screen = rects
+            self._visible = ((rects[:, 0] > -rects[:, 2]) & (rects[:, 0] < self.width) &
+                             (rects[:, 1] > -rects[:, 3]) & (rects[:, 1] < self.height))
+        self._led_blits = {}
+        self._screen_lists = {}
+        self._view_key = view_key
+    
     def _draw_responsive_panels(self):
         """
         Vẽ các panel UI responsive với nền trong suốt
@@ -1339,7 +2314,7 @@ class MultiDevicePreview:
             pygame.draw.rect(self.screen, (100, 100, 120, 180), header_rect, 1)
             
             # Vẽ tiêu đề
-            title_surface = self.font.render(panel['title'], True, (220, 220, 220))
+            title_surface = self._render_text(panel['title'], (220, 220, 220))
             title_rect = title_surface.get_rect(midleft=(rect.x + 10, rect.y + 15))
             self.screen.blit(title_surface, title_rect)
             
@@ -1371,6 +2346,38 @@ class MultiDevicePreview:
                 pygame.draw.rect(self.screen, (100, 100, 120, 180), body_rect, 1)
 
 
+    def _build_tool_icons(self):
+        """
+        Render the icon of every tool once onto a 30x30 surface, blitted by
+        _draw_tools each frame.
+        """
+        self._tool_icons = {}
+        for tool in self.tools:
+            icon = pygame.Surface((30, 30), pygame.SRCALPHA)
+            
+            if tool == "pan":
+                pygame.draw.line(icon, (220, 220, 220), (5, 15), (25, 15), 2)
+                pygame.draw.line(icon, (220, 220, 220), (15, 5), (15, 25), 2)
+            elif tool == "select":
+                pygame.draw.polygon(icon, (220, 220, 220), [(5, 5), (15, 25), (25, 15)])
+            elif tool == "add_device":
+                pygame.draw.rect(icon, (220, 220, 220), (5, 5, 20, 20), 1)
+                pygame.draw.line(icon, (220, 220, 220), (15, 8), (15, 22), 2)
+                pygame.draw.line(icon, (220, 220, 220), (8, 15), (22, 15), 2)
+            elif tool == "add_segment":
+                pygame.draw.line(icon, (220, 220, 220), (5, 15), (25, 15), 2)
+                for i in range(5):
+                    x = 5 + i * 5
+                    pygame.draw.circle(icon, (220, 220, 220), (x, 15), 2)
+            elif tool == "edit":
+                pygame.draw.line(icon, (220, 220, 220), (5, 25), (15, 5), 2)
+                pygame.draw.line(icon, (220, 220, 220), (15, 5), (25, 15), 2)
+            elif tool == "delete":
+                pygame.draw.line(icon, (220, 220, 220), (5, 5), (25, 25), 2)
+                pygame.draw.line(icon, (220, 220, 220), (5, 25), (25, 5), 2)
+            
+            self._tool_icons[tool] = icon.convert_alpha()
+            
     def _draw_tools(self):
         """
         Draw tools panel.
@@ -1381,13 +2388,19 @@ class MultiDevicePreview:
         pygame.draw.rect(self.screen, (100, 100, 120), tools_rect, 1)
         
         # Vẽ tiêu đề
-        title_surface = self.font.render("Tools", True, (220, 220, 220))
+        title_surface = self._render_text("Tools", (220, 220, 220))
         self.screen.blit(title_surface, (tools_rect.x + 5, tools_rect.y + 5))
         
         # Vẽ các nút công cụ
+        mouse_pos = pygame.mouse.get_pos()
         y_offset = tools_rect.y + 200
         for tool in self.tools:
-            tool_rect = pygame.Rect(tools_rect.x + 10, y_offset, 30, 30)
+            # Cập nhật vị trí nút công cụ tại chỗ
+            tool_rect = self.tool_buttons.get(tool)
+            if tool_rect is None:
+                tool_rect = self.tool_buttons[tool] = pygame.Rect(0, 0, 0, 0)
+            if _place_rect(tool_rect, tools_rect.x + 10, y_offset, 30, 30):
+                self._tool_rects_arr = None
             
             # Highlight công cụ hiện tại
             if tool == self.current_tool:
@@ -1398,58 +2411,14 @@ class MultiDevicePreview:
             pygame.draw.rect(self.screen, (100, 100, 120), tool_rect, 1)
             
             # Vẽ biểu tượng công cụ
-            if tool == "pan":
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                                (tool_rect.x + 5, tool_rect.y + 15),
-                                (tool_rect.x + 25, tool_rect.y + 15), 2)
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                                (tool_rect.x + 15, tool_rect.y + 5),
-                                (tool_rect.x + 15, tool_rect.y + 25), 2)
-            elif tool == "select":
-                pygame.draw.polygon(self.screen, (220, 220, 220), [
-                    (tool_rect.x + 5, tool_rect.y + 5),
-                    (tool_rect.x + 15, tool_rect.y + 25),
-                    (tool_rect.x + 25, tool_rect.y + 15)
-                ])
-            elif tool == "add_device":
-                pygame.draw.rect(self.screen, (220, 220, 220), 
-                                (tool_rect.x + 5, tool_rect.y + 5, 20, 20), 1)
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                                (tool_rect.x + 15, tool_rect.y + 8),
-                                (tool_rect.x + 15, tool_rect.y + 22), 2)
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                                (tool_rect.x + 8, tool_rect.y + 15),
-                                (tool_rect.x + 22, tool_rect.y + 15), 2)
-            elif tool == "add_segment":
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                                (tool_rect.x + 5, tool_rect.y + 15),
-                                (tool_rect.x + 25, tool_rect.y + 15), 2)
-                for i in range(5):
-                    x = tool_rect.x + 5 + i * 5
-                    pygame.draw.circle(self.screen, (220, 220, 220), (x, tool_rect.y + 15), 2)
-            elif tool == "edit":
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                                (tool_rect.x + 5, tool_rect.y + 25),
-                                (tool_rect.x + 15, tool_rect.y + 5), 2)
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                                (tool_rect.x + 15, tool_rect.y + 5),
-                                (tool_rect.x + 25, tool_rect.y + 15), 2)
-            elif tool == "delete":
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                                (tool_rect.x + 5, tool_rect.y + 5),
-                                (tool_rect.x + 25, tool_rect.y + 25), 2)
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                                (tool_rect.x + 5, tool_rect.y + 25),
-                                (tool_rect.x + 25, tool_rect.y + 5), 2)
-            
-            # Cập nhật vị trí nút công cụ
-            self.tool_buttons[tool] = tool_rect
+            icon = self._tool_icons.get(tool)
+            if icon is not None:
+                self.screen.blit(icon, tool_rect)
             
             # Vẽ text tooltip khi hover
-            mouse_pos = pygame.mouse.get_pos()
             if tool_rect.collidepoint(mouse_pos):
                 tooltip_text = tool.replace("_", " ").title()
-                tooltip = self.font.render(tooltip_text, True, (220, 220, 220))
+                tooltip = self._render_text(tooltip_text, (220, 220, 220))
                 tooltip_rect = tooltip.get_rect(midleft=(tool_rect.right + 5, tool_rect.centery))
                 
                 # Vẽ nền cho tooltip
@@ -1463,85 +2432,117 @@ class MultiDevicePreview:
     
     def _draw_panels(self):
 
-        status_rect = pygame.Rect(0, self.height - self.status_bar_height, self.width, self.status_bar_height)
+        status_rect = self._status_rect
+        status_rect.update(0, self.height - self.status_bar_height, self.width, self.status_bar_height)
         pygame.draw.rect(self.screen, (40, 40, 50), status_rect)
         pygame.draw.line(self.screen, (100, 100, 120), (0, self.height - self.status_bar_height), 
                         (self.width, self.height - self.status_bar_height), 1)
         
         if self.status_text:
-            status_surface = self.font.render(self.status_text, True, (220, 220, 220))
+            status_surface = self._render_text(self.status_text, (220, 220, 220))
             self.screen.blit(status_surface, (10, self.height - self.status_bar_height + 5))
         
+        # Panel thuộc tính ghi lại segment có tốc độ đang hiển thị, nếu được vẽ
+        self._speed_segment = None
+        
+        # Khung của panel được vẽ sẵn, mỗi panel chỉ cần một lần blits()
+        minimized_blits = []
+        view_bottom = self.height - self.status_bar_height
+        panel_views = self._panel_views
         for panel_id, panel_rect in self.panels.items():
-            if panel_id == "tools":
+            # Thanh công cụ được vẽ riêng bởi _draw_tools
+            view = panel_views.get(panel_id)
+            if view is None:
                 continue 
+            title, draw_content = view
+
+            # Bỏ qua panel đã bị kéo ra ngoài màn hình
+            if (panel_rect.right <= 0 or panel_rect.x >= self.width or
+                    panel_rect.bottom <= 0 or panel_rect.y >= view_bottom):
+                continue
 
             if panel_id in self.minimized_panels:
-                minimize_rect = pygame.Rect(panel_rect.x, panel_rect.y, 30, 25)
-                pygame.draw.rect(self.screen, (60, 60, 80), minimize_rect)
-                pygame.draw.rect(self.screen, (100, 100, 120), minimize_rect, 1)
-                
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                            (minimize_rect.centerx - 5, minimize_rect.centery),
-                            (minimize_rect.centerx + 5, minimize_rect.centery), 2)
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                            (minimize_rect.centerx, minimize_rect.centery - 5),
-                            (minimize_rect.centerx, minimize_rect.centery + 5), 2)
-                
+                minimized_blits.append((self._panel_chrome("minimized", 30, 25), panel_rect.topleft))
                 continue
 
             is_collapsed = panel_id in self.collapsed_panels
-
-            header_rect = pygame.Rect(panel_rect.x, panel_rect.y, panel_rect.width, 25)
-            pygame.draw.rect(self.screen, (60, 60, 80), header_rect)
-            pygame.draw.rect(self.screen, (100, 100, 120), header_rect, 1)
-
-            if panel_id == "properties":
-                title = "Properties"
-            elif panel_id == "devices":
-                title = "Devices"
-            elif panel_id == "effects":
-                title = "Effects"
-            else:
-                title = panel_id.title()
                 
-            title_surface = self.font.render(title, True, (220, 220, 220))
-            self.screen.blit(title_surface, (header_rect.x + 5, header_rect.y + 5))
+            chrome_blits = [
+                (self._panel_chrome("collapsed" if is_collapsed else "header", panel_rect.width, 25),
+                 panel_rect.topleft),
+                (self._render_text(title, (220, 220, 220)), (panel_rect.x + 5, panel_rect.y + 5)),
+            ]
 
-            collapse_rect = pygame.Rect(header_rect.right - 50, header_rect.y, 25, 25)
-            pygame.draw.rect(self.screen, (80, 80, 100), collapse_rect)
-            
             if is_collapsed:
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                            (collapse_rect.centerx - 5, collapse_rect.centery),
-                            (collapse_rect.centerx + 5, collapse_rect.centery), 2)
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                            (collapse_rect.centerx, collapse_rect.centery - 5),
-                            (collapse_rect.centerx, collapse_rect.centery + 5), 2)
-            else:
-                pygame.draw.line(self.screen, (220, 220, 220), 
-                            (collapse_rect.centerx - 5, collapse_rect.centery),
-                            (collapse_rect.centerx + 5, collapse_rect.centery), 2)
-                    
-            minimize_rect = pygame.Rect(header_rect.right - 25, header_rect.y, 25, 25)
-            pygame.draw.rect(self.screen, (80, 80, 100), minimize_rect)
-
-            pygame.draw.rect(self.screen, (220, 220, 220), 
-                        (minimize_rect.centerx - 4, minimize_rect.centery - 4, 8, 8), 1)
-
-            if not is_collapsed:
-
-                content_rect = pygame.Rect(panel_rect.x, panel_rect.y + 25, 
-                                        panel_rect.width, panel_rect.height - 25)
-                pygame.draw.rect(self.screen, (40, 40, 50, 200), content_rect)
-                pygame.draw.rect(self.screen, (100, 100, 120), content_rect, 1)
+                self.screen.blits(chrome_blits, doreturn=False)
+                continue
 
-                if panel_id == "properties":
-                    self._draw_properties_panel(content_rect)
-                elif panel_id == "devices":
-                    self._draw_devices_panel(content_rect)
-                elif panel_id == "effects":
-                    self._draw_effects_panel(content_rect)
+            content_rect = self._content_rect
+            content_rect.update(panel_rect.x, panel_rect.y + 25, 
+                                panel_rect.width, panel_rect.height - 25)
+            if content_rect.height > 0:
+                chrome_blits.append((self._panel_chrome("content", content_rect.width, content_rect.height),
+                                     content_rect.topleft))
+            self.screen.blits(chrome_blits, doreturn=False)
+            draw_content(content_rect)
+                
+        if minimized_blits:
+            self.screen.blits(minimized_blits, doreturn=False)
+            
+    def _panel_chrome(self, part: str, width: int, height: int) -> pygame.Surface:
+        """
+        Get a prerendered part of the panel chrome, drawn once per size.
+        
+        Args:
+            part (str): "header", "collapsed" (header of a collapsed panel),
+                        "content" (content frame) or "minimized" (minimized button)
+            width (int): Width in pixels
+            height (int): Height in pixels
+            
+        Returns:
+            pygame.Surface: The rendered part
+        """
+        key = (part, width, height)
+        surface = self._chrome_cache.get(key)
+        if surface is not None:
+            return surface
+            
+        surface = pygame.Surface((width, height))
+        frame = pygame.Rect(0, 0, width, height)
+        
+        if part == "content":
+            surface.fill((40, 40, 50))
+            pygame.draw.rect(surface, (100, 100, 120), frame, 1)
+            
+        elif part == "minimized":
+            surface.fill((60, 60, 80))
+            pygame.draw.rect(surface, (100, 100, 120), frame, 1)
+            pygame.draw.line(surface, (220, 220, 220), (frame.centerx - 5, frame.centery),
+                             (frame.centerx + 5, frame.centery), 2)
+            pygame.draw.line(surface, (220, 220, 220), (frame.centerx, frame.centery - 5),
+                             (frame.centerx, frame.centery + 5), 2)
+            
+        else:
+            surface.fill((60, 60, 80))
+            pygame.draw.rect(surface, (100, 100, 120), frame, 1)
+            
+            # Nút thu gọn: dấu trừ, hoặc dấu cộng khi đã thu gọn
+            collapse_rect = pygame.Rect(width - 50, 0, 25, 25)
+            pygame.draw.rect(surface, (80, 80, 100), collapse_rect)
+            pygame.draw.line(surface, (220, 220, 220), (collapse_rect.centerx - 5, collapse_rect.centery),
+                             (collapse_rect.centerx + 5, collapse_rect.centery), 2)
+            if part == "collapsed":
+                pygame.draw.line(surface, (220, 220, 220), (collapse_rect.centerx, collapse_rect.centery - 5),
+                                 (collapse_rect.centerx, collapse_rect.centery + 5), 2)
+                                 
+            # Nút thu nhỏ
+            minimize_rect = pygame.Rect(width - 25, 0, 25, 25)
+            pygame.draw.rect(surface, (80, 80, 100), minimize_rect)
+            pygame.draw.rect(surface, (220, 220, 220),
+                             (minimize_rect.centerx - 4, minimize_rect.centery - 4, 8, 8), 1)
+                             
+        surface = self._chrome_cache[key] = surface.convert()
+        return surface
                     
     def _draw_properties_panel(self, rect):
         """
@@ -1550,6 +2551,12 @@ class MultiDevicePreview:
         Args:
             rect (pygame.Rect): Panel rectangle
         """
+        screen = self.screen
+        blit = screen.blit
+        draw_rect = pygame.draw.rect
+        render_text = self._render_text
+        effects_dict = self.effect_manager.effects
+        
         y_offset = rect.y + 10
         button_height = 25
         spacing = 5
@@ -1560,22 +2567,16 @@ class MultiDevicePreview:
             if device_info:
                 # Tiêu đề
                 title = f"Device: {device_info.get('name', self.selected_device)}"
-                title_surface = self.font.render(title, True, (220, 220, 220))
-                self.screen.blit(title_surface, (rect.x + 10, y_offset))
+                title_surface = render_text(title, (220, 220, 220))
+                blit(title_surface, (rect.x + 10, y_offset))
                 y_offset += 25
                 
                 # Thông tin thiết bị
-                props = [
-                    f"ID: {self.selected_device}",
-                    f"LED Count: {device_info.get('led_count', 0)}",
-                    f"Position: ({device_info.get('position', (0, 0))[0]:.1f}, {device_info.get('position', (0, 0))[1]:.1f})",
-                    f"Rotation: {device_info.get('rotation', 0):.1f}°",
-                    f"Segments: {len(device_info.get('segments', []))}",
-                ]
+                props = self._device_props(self.selected_device, device_info)
                 
                 for prop in props:
-                    prop_surface = self.font.render(prop, True, (200, 200, 200))
-                    self.screen.blit(prop_surface, (rect.x + 20, y_offset))
+                    prop_surface = render_text(prop, (200, 200, 200))
+                    blit(prop_surface, (rect.x + 20, y_offset))
                     y_offset += 20
                     
                 y_offset += 10  # Thêm khoảng cách
@@ -1585,95 +2586,88 @@ class MultiDevicePreview:
             if segment_info:
                 # Tiêu đề
                 title = f"Segment: {self.selected_segment}"
-                title_surface = self.font.render(title, True, (220, 220, 220))
-                self.screen.blit(title_surface, (rect.x + 10, y_offset))
+                title_surface = render_text(title, (220, 220, 220))
+                blit(title_surface, (rect.x + 10, y_offset))
                 y_offset += 25
                 
                 # Thông tin segment
-                props = [
-                    f"Device: {segment_info.get('device_id', '')}",
-                    f"Range: {segment_info.get('start', 0)} - {segment_info.get('end', 0)}",
-                    f"Length: {segment_info.get('end', 0) - segment_info.get('start', 0) + 1} LEDs",
-                    f"Position: ({segment_info.get('position', (0, 0))[0]:.1f}, {segment_info.get('position', (0, 0))[1]:.1f})",
-                    f"Rotation: {segment_info.get('rotation', 0):.1f}°",
-                ]
+                props = self._segment_props(self.selected_segment, segment_info)
                 
                 for prop in props:
-                    prop_surface = self.font.render(prop, True, (200, 200, 200))
-                    self.screen.blit(prop_surface, (rect.x + 20, y_offset))
+                    prop_surface = render_text(prop, (200, 200, 200))
+                    blit(prop_surface, (rect.x + 20, y_offset))
                     y_offset += 20
                 
                 y_offset += 10  # Thêm khoảng cách
                 
                 # --- Hiệu ứng hiện tại ---
-                effect_title = self.font.render("Current Effect:", True, (220, 220, 220))
-                self.screen.blit(effect_title, (rect.x + 10, y_offset))
+                effect_title = render_text("Current Effect:", (220, 220, 220))
+                blit(effect_title, (rect.x + 10, y_offset))
                 y_offset += 25
                 
                 # Lấy hiệu ứng hiện tại (nếu có)
                 current_effect = None
                 effect_name = "None"
-                if self.device_manager and self.selected_segment in self.device_manager.segments:
-                    segment = self.device_manager.segments[self.selected_segment]
-                    if segment.effect_id is not None and segment.effect_id in self.effect_manager.effects:
-                        current_effect = segment.effect_id
-                        effect_name = f"Effect {current_effect}"
+                segment = self.device_manager.segments.get(self.selected_segment) if self.device_manager else None
+                if segment is not None and segment.effect_id is not None and segment.effect_id in effects_dict:
+                    current_effect = segment.effect_id
+                    effect_name = f"Effect {current_effect}"
                 
                 # Hiển thị hiệu ứng hiện tại
-                effect_rect = pygame.Rect(rect.x + 20, y_offset, rect.width - 40, button_height)
-                pygame.draw.rect(self.screen, (60, 60, 80), effect_rect)
-                pygame.draw.rect(self.screen, (100, 100, 120), effect_rect, 1)
+                effect_rect = self._row_rect
+                effect_rect.update(rect.x + 20, y_offset, rect.width - 40, button_height)
+                draw_rect(screen, (60, 60, 80), effect_rect)
+                draw_rect(screen, (100, 100, 120), effect_rect, 1)
                 
-                current_effect_text = self.font.render(effect_name, True, (200, 200, 200))
-                self.screen.blit(current_effect_text, (effect_rect.x + 5, effect_rect.y + 5))
+                current_effect_text = render_text(effect_name, (200, 200, 200))
+                blit(current_effect_text, (effect_rect.x + 5, effect_rect.y + 5))
                 
                 y_offset += button_height + spacing
                 
                 # --- Dropdown chọn hiệu ứng mới ---
-                dropdown_label = self.font.render("Select Effect:", True, (220, 220, 220))
-                self.screen.blit(dropdown_label, (rect.x + 10, y_offset))
+                dropdown_label = render_text("Select Effect:", (220, 220, 220))
+                blit(dropdown_label, (rect.x + 10, y_offset))
                 y_offset += 20
                 
                 # Vẽ dropdown để chọn hiệu ứng
-                dropdown_rect = pygame.Rect(rect.x + 20, y_offset, rect.width - 40, button_height)
-                
                 # Tạo key cho dropdown hiệu ứng nếu chưa có
-                dropdown_key = f"effect_dropdown_{self.selected_segment}"
+                segment_ui = self._segment_ui.get(self.selected_segment)
+                if segment_ui is None:
+                    segment_ui = self._segment_ui[self.selected_segment] = _SegmentUI(self.selected_segment)
+                dropdown_key = segment_ui.dropdown_key
                 if dropdown_key not in self.ui_dropdowns:
-                    # Tạo danh sách hiệu ứng có sẵn
-                    effect_options = ["None"] + [f"Effect {i}" for i in self.effect_manager.effects.keys()]
-                    selected_idx = 0
-                    if current_effect is not None:
-                        if current_effect in self.effect_manager.effects:
-                            selected_idx = list(self.effect_manager.effects.keys()).index(current_effect) + 1
+                    # Danh sách hiệu ứng có sẵn, ID hiệu ứng song song với các tùy chọn
+                    effect_ids, effect_options, option_index = self._get_effect_options()
+                    selected_idx = option_index.get(current_effect, 0)
                             
                     self.ui_dropdowns[dropdown_key] = {
-                        "rect": dropdown_rect,
+                        "rect": pygame.Rect(rect.x + 20, y_offset, rect.width - 40, button_height),
                         "options": effect_options,
                         "selected_index": selected_idx, 
                         "open": False,
-                        "hover_index": -1
+                        "hover_index": -1,
+                        "kind": "effect",
+                        "segment_id": self.selected_segment,
+                        "effect_ids": effect_ids
                     }
+                    self._ui_hash = None
                 
                 # Lấy thông tin dropdown
                 dropdown = self.ui_dropdowns[dropdown_key]
-                dropdown["rect"] = dropdown_rect  # Cập nhật vị trí (có thể đã thay đổi do kéo panel)
+                dropdown_rect = dropdown["rect"]
+                if _place_rect(dropdown_rect, rect.x + 20, y_offset, rect.width - 40, button_height):
+                    self._ui_hash = None  # Cập nhật vị trí (có thể đã thay đổi do kéo panel)
                 
                 # Vẽ dropdown
-                pygame.draw.rect(self.screen, (60, 60, 80), dropdown_rect)
-                pygame.draw.rect(self.screen, (100, 100, 120), dropdown_rect, 1)
+                draw_rect(screen, (60, 60, 80), dropdown_rect)
+                draw_rect(screen, (100, 100, 120), dropdown_rect, 1)
                 
                 selected_option = dropdown["options"][dropdown["selected_index"]]
-                selected_text = self.font.render(selected_option, True, (200, 200, 200))
-                self.screen.blit(selected_text, (dropdown_rect.x + 5, dropdown_rect.y + 5))
+                selected_text = render_text(selected_option, (200, 200, 200))
+                blit(selected_text, (dropdown_rect.x + 5, dropdown_rect.y + 5))
                 
                 # Vẽ mũi tên dropdown
-                arrow_points = [
-                    (dropdown_rect.right - 15, dropdown_rect.centery - 3),
-                    (dropdown_rect.right - 5, dropdown_rect.centery - 3),
-                    (dropdown_rect.right - 10, dropdown_rect.centery + 3)
-                ]
-                pygame.draw.polygon(self.screen, (200, 200, 200), arrow_points)
+                blit(self._arrow_surf, (dropdown_rect.right - 15, dropdown_rect.centery - 3))
                 
                 # Nếu dropdown đang mở, hiển thị các tùy chọn
                 if dropdown["open"]:
@@ -1682,68 +2676,80 @@ class MultiDevicePreview:
                     
                     # Vẽ nền cho dropdown list
                     list_height = min(len(options) * option_height, 5 * option_height)
-                    list_rect = pygame.Rect(dropdown_rect.x, dropdown_rect.bottom, dropdown_rect.width, list_height)
-                    pygame.draw.rect(self.screen, (50, 50, 60), list_rect)
-                    pygame.draw.rect(self.screen, (100, 100, 120), list_rect, 1)
+                    list_rect = self._list_rect
+                    list_rect.update(dropdown_rect.x, dropdown_rect.bottom, dropdown_rect.width, list_height)
+                    draw_rect(screen, (50, 50, 60), list_rect)
+                    draw_rect(screen, (100, 100, 120), list_rect, 1)
+                    
+                    # Text của các tùy chọn được render khi mở và khi danh sách tùy chọn đổi
+                    rendered = dropdown.get("_rendered")
+                    if rendered is None or rendered[0] is not options:
+                        rendered = dropdown["_rendered"] = (
+                            options,
+                            [render_text(option, (200, 200, 200)) for option in options[:5]]  # Giới hạn hiển thị 5 tùy chọn
+                        )
                     
                     # Vẽ các tùy chọn
-                    for i, option in enumerate(options[:5]):  # Giới hạn hiển thị 5 tùy chọn
-                        option_rect = pygame.Rect(
+                    option_rect = self._row_rect
+                    for i, option_text in enumerate(rendered[1]):
+                        option_rect.update(
                             list_rect.x, list_rect.y + i * option_height, 
                             list_rect.width, option_height
                         )
                         
                         if i == dropdown["hover_index"]:
-                            pygame.draw.rect(self.screen, (70, 70, 90), option_rect)
+                            draw_rect(screen, (70, 70, 90), option_rect)
                         
-                        option_text = self.font.render(option, True, (200, 200, 200))
-                        self.screen.blit(option_text, (option_rect.x + 5, option_rect.y + 5))
+                        blit(option_text, (option_rect.x + 5, option_rect.y + 5))
+                elif "_rendered" in dropdown:
+                    del dropdown["_rendered"]
                 
                 y_offset += button_height + spacing
                 
                 # --- Nút Apply Effect ---
-                apply_button_rect = pygame.Rect(rect.x + 20, y_offset, rect.width - 40, button_height)
-                
                 # Tạo key cho nút apply nếu chưa có
-                apply_button_key = f"apply_effect_{self.selected_segment}"
+                apply_button_key = segment_ui.apply_key
                 if apply_button_key not in self.ui_buttons:
                     self.ui_buttons[apply_button_key] = {
-                        "rect": apply_button_rect,
+                        "rect": pygame.Rect(rect.x + 20, y_offset, rect.width - 40, button_height),
                         "text": "Apply Effect",
                         "active": False,
-                        "hover": False
+                        "hover": False,
+                        "kind": "apply_effect",
+                        "segment_id": self.selected_segment
                     }
+                    self._ui_hash = None
                 
                 # Lấy thông tin nút
                 button = self.ui_buttons[apply_button_key]
-                button["rect"] = apply_button_rect  # Cập nhật vị trí
+                apply_button_rect = button["rect"]
+                if _place_rect(apply_button_rect, rect.x + 20, y_offset, rect.width - 40, button_height):
+                    self._ui_hash = None  # Cập nhật vị trí
                 
                 # Vẽ nút Apply
                 if button["active"]:
-                    pygame.draw.rect(self.screen, (70, 130, 70), apply_button_rect)
+                    draw_rect(screen, (70, 130, 70), apply_button_rect)
                 elif button["hover"]:
-                    pygame.draw.rect(self.screen, (70, 110, 70), apply_button_rect)
+                    draw_rect(screen, (70, 110, 70), apply_button_rect)
                 else:
-                    pygame.draw.rect(self.screen, (60, 100, 60), apply_button_rect)
+                    draw_rect(screen, (60, 100, 60), apply_button_rect)
                     
-                pygame.draw.rect(self.screen, (100, 150, 100), apply_button_rect, 1)
+                draw_rect(screen, (100, 150, 100), apply_button_rect, 1)
                 
-                apply_text = self.font.render(button["text"], True, (220, 220, 220))
+                apply_text = render_text(button["text"], (220, 220, 220))
                 text_rect = apply_text.get_rect(center=apply_button_rect.center)
-                self.screen.blit(apply_text, text_rect)
+                blit(apply_text, text_rect)
                 
                 y_offset += button_height + spacing
                 
                 # Thêm thông tin về các tham số hiệu ứng
-                effect_id = None
+                effect = None
                 if dropdown["selected_index"] > 0:  # Nếu không phải "None"
-                    effect_id = list(self.effect_manager.effects.keys())[dropdown["selected_index"] - 1]
-                    
-                if effect_id is not None and effect_id in self.effect_manager.effects:
-                    effect = self.effect_manager.effects[effect_id]
+                    effect = effects_dict.get(dropdown["effect_ids"][dropdown["selected_index"]])
                     
-                    param_title = self.font.render("Effect Parameters:", True, (220, 220, 220))
-                    self.screen.blit(param_title, (rect.x + 10, y_offset))
+                if effect is not None:
+                    param_title = render_text("Effect Parameters:", (220, 220, 220))
+                    blit(param_title, (rect.x + 10, y_offset))
                     y_offset += 25
                     
                     # Hiển thị các tham số của hiệu ứng
@@ -1752,46 +2758,134 @@ class MultiDevicePreview:
                         
                         # Hiển thị slider để điều chỉnh tốc độ nếu có
                         if hasattr(segment, 'move_speed'):
-                            speed_label = self.font.render(f"Speed: {segment.move_speed:.1f}", True, (200, 200, 200))
-                            self.screen.blit(speed_label, (rect.x + 20, y_offset))
+                            self._speed_segment = segment
+                            speed_label = render_text(f"Speed: {segment.move_speed:.1f}", (200, 200, 200))
+                            blit(speed_label, (rect.x + 20, y_offset))
                             y_offset += 20
                             
-                            speed_slider_rect = pygame.Rect(rect.x + 20, y_offset, rect.width - 40, 10)
-                            speed_slider_key = f"speed_slider_{self.selected_segment}"
+                            speed_slider_key = segment_ui.slider_key
                             
                             if speed_slider_key not in self.ui_sliders:
                                 self.ui_sliders[speed_slider_key] = {
-                                    "rect": speed_slider_rect,
+                                    "rect": pygame.Rect(rect.x + 20, y_offset, rect.width - 40, 10),
                                     "min_value": -50.0,
                                     "max_value": 50.0,
                                     "value": segment.move_speed,
-                                    "dragging": False
+                                    "dragging": False,
+                                    "kind": "speed",
+                                    "segment_id": self.selected_segment,
+                                    "dropdown_id": dropdown_key
                                 }
+                                self._ui_hash = None
                             
                             slider = self.ui_sliders[speed_slider_key]
-                            slider["rect"] = speed_slider_rect  # Cập nhật vị trí
+                            speed_slider_rect = slider["rect"]
+                            if _place_rect(speed_slider_rect, rect.x + 20, y_offset, rect.width - 40, 10):
+                                self._ui_hash = None  # Cập nhật vị trí
                             
                             # Vẽ slider
-                            pygame.draw.rect(self.screen, (40, 40, 50), speed_slider_rect)
+                            draw_rect(screen, (40, 40, 50), speed_slider_rect)
                             
                             # Tính vị trí handle
-                            range_value = slider["max_value"] - slider["min_value"]
-                            pos_ratio = (slider["value"] - slider["min_value"]) / range_value
-                            handle_pos = speed_slider_rect.x + pos_ratio * speed_slider_rect.width
+                            handle_pos = self._slider_handle_x(slider)
                             
                             # Vẽ bar đã điền
-                            filled_rect = pygame.Rect(
+                            part_rect = self._row_rect
+                            part_rect.update(
                                 speed_slider_rect.x, speed_slider_rect.y,
                                 handle_pos - speed_slider_rect.x, speed_slider_rect.height
                             )
-                            pygame.draw.rect(self.screen, (60, 100, 150), filled_rect)
+                            draw_rect(screen, (60, 100, 150), part_rect)
                             
                             # Vẽ handle
-                            handle_rect = pygame.Rect(handle_pos - 5, speed_slider_rect.y - 5, 10, 20)
-                            pygame.draw.rect(self.screen, (100, 140, 200), handle_rect)
+                            part_rect.update(handle_pos - 5, speed_slider_rect.y - 5, 10, 20)
+                            draw_rect(screen, (100, 140, 200), part_rect)
                             
                             y_offset += 25
 
+    def _device_props(self, device_id: str, device_info: Dict[str, Any]) -> List[str]:
+        """
+        Get the property lines of a device, formatted again only when one of
+        the shown values changed.
+        
+        Args:
+            device_id (str): ID of the device
+            device_info (Dict[str, Any]): Layout entry of the device
+            
+        Returns:
+            List[str]: Lines shown in the properties panel
+        """
+        led_count = device_info.get("led_count", 0)
+        position = device_info.get("position", (0, 0))
+        rotation = device_info.get("rotation", 0)
+        segment_count = len(device_info.get("segments", []))
+        
+        # Position is compared by value, it may be a list loaded from JSON
+        key = (led_count, position[0], position[1], rotation, segment_count)
+        cached = self._props_cache.get(("device", device_id))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+            
+        props = [
+            f"ID: {device_id}",
+            f"LED Count: {led_count}",
+            f"Position: ({position[0]:.1f}, {position[1]:.1f})",
+            f"Rotation: {rotation:.1f}°",
+            f"Segments: {segment_count}",
+        ]
+        self._props_cache[("device", device_id)] = (key, props)
+        return props
+        
+    def _segment_props(self, segment_id: str, segment_info: Dict[str, Any]) -> List[str]:
+        """
+        Get the property lines of a segment, formatted again only when one of
+        the shown values changed.
+        
+        Args:
+            segment_id (str): ID of the segment
+            segment_info (Dict[str, Any]): Layout entry of the segment
+            
+        Returns:
+            List[str]: Lines shown in the properties panel
+        """
+        device_id = segment_info.get("device_id", "")
+        start = segment_info.get("start", 0)
+        end = segment_info.get("end", 0)
+        position = segment_info.get("position", (0, 0))
+        rotation = segment_info.get("rotation", 0)
+        
+        key = (device_id, start, end, position[0], position[1], rotation)
+        cached = self._props_cache.get(("segment", segment_id))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+            
+        props = [
+            f"Device: {device_id}",
+            f"Range: {start} - {end}",
+            f"Length: {end - start + 1} LEDs",
+            f"Position: ({position[0]:.1f}, {position[1]:.1f})",
+            f"Rotation: {rotation:.1f}°",
+        ]
+        self._props_cache[("segment", segment_id)] = (key, props)
+        return props
+        
+    def _get_effect_options(self) -> Tuple[List, List[str], Dict[Any, int]]:
+        """
+        Get the options of the effect dropdowns, rebuilt only after effects
+        were added to or removed from the effect manager.
+        
+        Returns:
+            Tuple[List, List[str], Dict[Any, int]]: Effect ID of each option (None first),
+                the option labels, and the option index of each effect ID
+        """
+        version = self.effect_manager.effects_version
+        if self._effect_options is None or self._effect_options[0] != version:
+            effect_ids = [None] + list(self.effect_manager.effects.keys())
+            options = ["None"] + [f"Effect {i}" for i in effect_ids[1:]]
+            option_index = {effect_id: i for i, effect_id in enumerate(effect_ids) if i}
+            self._effect_options = (version, effect_ids, options, option_index)
+        return self._effect_options[1:]
+        
     def _draw_devices_panel(self, rect):
         """
         Draw devices panel content.
@@ -1799,36 +2893,67 @@ class MultiDevicePreview:
         Args:
             rect (pygame.Rect): Panel rectangle
         """
+        screen = self.screen
+        blit = screen.blit
+        draw_rect = pygame.draw.rect
+        render_text = self._render_text
+        
         y_offset = rect.y + 10
         
         # Tiêu đề
         title = f"Devices: {len(self.layout_settings.devices)}"
-        title_surface = self.font.render(title, True, (220, 220, 220))
-        self.screen.blit(title_surface, (rect.x + 10, y_offset))
+        title_surface = render_text(title, (220, 220, 220))
+        blit(title_surface, (rect.x + 10, y_offset))
         y_offset += 25
         
-        # Danh sách thiết bị
-        for device_id, device_info in self.layout_settings.devices.items():
-            device_rect = pygame.Rect(rect.x + 5, y_offset, rect.width - 10, 25)
+        # Danh sách thiết bị, chỉ các dòng bắt đầu trong panel
+        # Text của các dòng được blit một lần sau vòng lặp; các dòng không chồng lên nhau
+        ids, names, colors, led_texts = self._get_device_rows()
+        bottom = min(rect.bottom, self.height - self.status_bar_height)
+        visible = min(len(ids), max(0, (bottom - y_offset + 29) // 30))
+        
+        text_blits = []
+        selected_device = self.selected_device
+        device_rect = self._row_rect
+        for i in range(visible):
+            device_rect.update(rect.x + 5, y_offset, rect.width - 10, 25)
             
             # Highlight thiết bị đã chọn
-            if device_id == self.selected_device:
-                pygame.draw.rect(self.screen, (80, 80, 120), device_rect)
+            if ids[i] == selected_device:
+                draw_rect(screen, (80, 80, 120), device_rect)
             
             # Vẽ tên thiết bị
-            device_name = device_info.get("name", f"Device {device_id}")
-            device_color = device_info.get("color", (200, 200, 200))
-            
-            name_surface = self.font.render(device_name, True, device_color)
-            self.screen.blit(name_surface, (device_rect.x + 5, device_rect.y + 5))
+            name_surface = render_text(names[i], colors[i])
+            text_blits.append((name_surface, (device_rect.x + 5, device_rect.y + 5)))
             
             # Vẽ thông tin LED
-            led_count = device_info.get("led_count", 0)
-            led_info = f"{led_count} LEDs"
-            led_surface = self.font.render(led_info, True, (180, 180, 180))
-            self.screen.blit(led_surface, (device_rect.right - led_surface.get_width() - 5, device_rect.y + 5))
+            led_surface = render_text(led_texts[i], (180, 180, 180))
+            text_blits.append((led_surface, (device_rect.right - led_surface.get_width() - 5, device_rect.y + 5)))
             
             y_offset += 30
+            
+        screen.blits(text_blits, doreturn=False)
+        
+    def _get_device_rows(self) -> Tuple[List[str], List[str], List[Tuple], List[str]]:
+        """
+        Get the devices panel rows as parallel lists, built again only when
+        devices were added, removed or loaded.
+        
+        Returns:
+            Tuple[List[str], List[str], List[Tuple], List[str]]: Device IDs,
+            names, name colors and LED count texts, in layout order
+        """
+        layout = self.layout_settings
+        if self._device_rows is None or self._device_rows_version != layout.devices_version:
+            ids, names, colors, led_texts = [], [], [], []
+            for device_id, device_info in layout.devices.items():
+                ids.append(device_id)
+                names.append(device_info.get("name", f"Device {device_id}"))
+                colors.append(tuple(device_info.get("color", (200, 200, 200))))
+                led_texts.append(f"{device_info.get('led_count', 0)} LEDs")
+            self._device_rows = (ids, names, colors, led_texts)
+            self._device_rows_version = layout.devices_version
+        return self._device_rows
     
     def _draw_effects_panel(self, rect):
         """
@@ -1837,6 +2962,11 @@ class MultiDevicePreview:
         Args:
             rect (pygame.Rect): Panel rectangle
         """
+        screen = self.screen
+        blit = screen.blit
+        draw_rect = pygame.draw.rect
+        render_text = self._render_text
+        
         y_offset = rect.y + 10
         
         # Tiêu đề
@@ -1844,70 +2974,99 @@ class MultiDevicePreview:
         active_effects = self.effect_manager.active_effect_ids
         
         title = f"Effects: {len(active_effects)}/{len(effects)}"
-        title_surface = self.font.render(title, True, (220, 220, 220))
-        self.screen.blit(title_surface, (rect.x + 10, y_offset))
+        title_surface = render_text(title, (220, 220, 220))
+        blit(title_surface, (rect.x + 10, y_offset))
         y_offset += 25
         
-        # Danh sách hiệu ứng
+        # Danh sách hiệu ứng, chỉ các dòng bắt đầu trong panel
+        text_blits = []
+        bottom = min(rect.bottom, self.height - self.status_bar_height)
+        effect_rect = self._row_rect
         for effect_id, effect in effects.items():
-            effect_rect = pygame.Rect(rect.x + 5, y_offset, rect.width - 10, 25)
+            if y_offset >= bottom:
+                break
+                
+            effect_rect.update(rect.x + 5, y_offset, rect.width - 10, 25)
             
             # Vẽ nền
             if effect_id in active_effects:
-                pygame.draw.rect(self.screen, (60, 80, 60), effect_rect)
+                draw_rect(screen, (60, 80, 60), effect_rect)
             else:
-                pygame.draw.rect(self.screen, (60, 60, 60), effect_rect)
+                draw_rect(screen, (60, 60, 60), effect_rect)
             
             # Vẽ tên hiệu ứng
             effect_name = f"Effect {effect_id}"
-            effect_surface = self.font.render(effect_name, True, (200, 200, 200))
-            self.screen.blit(effect_surface, (effect_rect.x + 5, effect_rect.y + 5))
+            effect_surface = render_text(effect_name, (200, 200, 200))
+            text_blits.append((effect_surface, (effect_rect.x + 5, effect_rect.y + 5)))
             
             # Vẽ thông tin hiệu ứng
             segments_count = len(effect.segments)
             segment_info = f"{segments_count} segments"
-            segment_surface = self.font.render(segment_info, True, (180, 180, 180))
-            self.screen.blit(segment_surface, (effect_rect.right - segment_surface.get_width() - 5, effect_rect.y + 5))
+            segment_surface = render_text(segment_info, (180, 180, 180))
+            text_blits.append((segment_surface, (effect_rect.right - segment_surface.get_width() - 5,
+                                                 effect_rect.y + 5)))
             
             y_offset += 30
+            
+        screen.blits(text_blits, doreturn=False)
     
     def _draw_stats(self):
         """
         Draw performance statistics.
         """
-        if not self.fps_history:
+        if not self._stats_idx:
             return
             
-        avg_fps = sum(self.fps_history) / len(self.fps_history)
-        current_fps = self.fps_history[-1]
-        
-        if self.render_times:
-            avg_render_time = sum(self.render_times) / len(self.render_times)
-            max_render_time = max(self.render_times)
-        else:
-            avg_render_time = 0
-            max_render_time = 0
+        # Chỉ tính lại FPS và thời gian render vài lần mỗi giây
+        now = pygame.time.get_ticks()
+        if self._stats_lines is None or now - self._stats_time >= _STATS_REFRESH_MS:
+            # Only the filled part of the ring buffers holds samples
+            filled = min(self._stats_idx, _STATS_WINDOW)
+            fps = self._fps_buf[:filled]
+            render_times = self._render_buf[:filled]
+            
+            avg_fps = fps.mean()
+            current_fps = self._fps_buf[(self._stats_idx - 1) & (_STATS_WINDOW - 1)]
+            avg_render_time = render_times.mean()
+            max_render_time = render_times.max()
+            
+            self._stats_lines = [
+                f"FPS: {current_fps:.1f} ({avg_fps:.1f} avg)",
+                f"Render: {avg_render_time:.1f}ms (Max: {max_render_time:.1f}ms)",
+            ]
+            self._stats_time = now
             
         # Chuẩn bị các thống kê
-        stats = [
-            f"FPS: {current_fps:.1f} ({avg_fps:.1f} avg)",
-            f"Render: {avg_render_time:.1f}ms (Max: {max_render_time:.1f}ms)",
+        stats = self._stats_lines + [
             f"Zoom: {self.zoom:.2f}x",
             f"Devices: {len(self.layout_settings.devices)}",
             f"Segments: {len(self.layout_settings.segments)}",
         ]
         
-        # Vẽ nền
-        stats_width = 200
-        stats_height = len(stats) * 20 + 10
-        stats_rect = pygame.Rect(5, 5, stats_width, stats_height)
-        
-        pygame.draw.rect(self.screen, (0, 0, 0, 128), stats_rect)
+        # Vẽ nền, draw.rect trên màn hình không giữ alpha nên blit nền đã dựng sẵn
+        stats_bg = self._stats_bg
+        if stats_bg is None or stats_bg.get_height() != len(stats) * 20 + 10:
+            stats_bg = self._stats_bg = self._make_stats_bg(len(stats))
+        self._dirty_rects.append(self.screen.blit(stats_bg, (5, 5)))
         
         # Vẽ các dòng thống kê
-        for i, stat in enumerate(stats):
-            stat_surface = self.font.render(stat, True, (220, 220, 220))
-            self.screen.blit(stat_surface, (10, 10 + i * 20))
+        render_text = self._render_text
+        self.screen.blits([(render_text(stat, (220, 220, 220)), (10, 10 + i * 20))
+                           for i, stat in enumerate(stats)], doreturn=False)
+        
+    def _make_stats_bg(self, line_count: int) -> pygame.Surface:
+        """
+        Render the translucent background of the stats overlay.
+        
+        Args:
+            line_count (int): Number of stats lines drawn over it
+            
+        Returns:
+            pygame.Surface: 200 px wide background with 50% black alpha
+        """
+        surface = pygame.Surface((200, line_count * 20 + 10), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 128))
+        return surface.convert_alpha()
     
     def _draw_selection_info(self):
         """
@@ -1916,6 +3075,22 @@ class MultiDevicePreview:
         # Thông tin được hiển thị trong panel Properties
         pass
     
+    def to_rgb565(self) -> np.ndarray:
+        """
+        Get the current colors of all LEDs packed as RGB565, for transports
+        and small displays that take 2 bytes per LED.
+        
+        Returns:
+            np.ndarray: RGB565 color of each LED in device offset order (uint16)
+        """
+        with self._swap_lock:
+            led_buf = self._led_buf
+            
+        r = led_buf[:, 0].astype(np.uint16)
+        g = led_buf[:, 1].astype(np.uint16)
+        b = led_buf[:, 2].astype(np.uint16)
+        return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+        
     def save_layout(self, filename: str):
         """
         Save the current layout to a file.